@@ -0,0 +1,77 @@
+"""Benchmark near-duplicate detection against the old per-shingle MinHash
+
+Times the MinHash signatures alone (vectorized vs the previous pure Python
+loop) and the whole NearDuplicateDetector.cluster on synthetic news entries,
+a fifth of which are reworded copies of another entry.
+
+Usage:
+    python -m benchmarks.bench_dedup [--entries 10000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.dedup import NearDuplicateDetector, _hash_shingle, shingles
+
+VOCABULARY = """
+cloud security startup funding model chip battery launch privacy court ruling outage browser update
+robot satellite merger layoffs lawsuit smartphone console streaming network quantum encryption vehicle
+drone patent subscription regulator antitrust datacenter processor benchmark vulnerability breach
+""".split()
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def old_signature(perms, text_shingles):
+    """The previous signature: 64 modular hashes per shingle in a Python generator"""
+    hashes = [_hash_shingle(s) for s in text_shingles]
+    if not hashes:
+        return tuple([_MAX_HASH] * len(perms))
+    return tuple(min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in perms)
+
+
+def synthetic_texts(count, seed=0):
+    """Titles and summaries like the fetcher's, 20% of them copies of an earlier text with one word swapped"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        if texts and rng.random() < 0.2:
+            words = rng.choice(texts).split(" ")
+            words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            texts.append(" ".join(words))
+        else:
+            texts.append(f"{' '.join(rng.sample(VOCABULARY, 6))}\n{' '.join(rng.sample(VOCABULARY, 20))}")
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.entries)
+    detector = NearDuplicateDetector()
+    shingle_sets = [shingles(text, detector.shingle_size) for text in texts]
+    rng = random.Random(1)
+    perms = [(rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1)) for _ in range(detector.num_perm)]
+
+    print(f"{len(texts)} synthetic entries, {detector.num_perm} permutations")
+    timings = {
+        "signatures, per shingle (old)": lambda: [old_signature(perms, shingle_set) for shingle_set in shingle_sets],
+        "signatures, vectorized": lambda: detector._signatures(shingle_sets),
+        "cluster (shingles + signatures + LSH)": lambda: detector.cluster(texts),
+    }
+    for name, func in timings.items():
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        print(f"{name:40s} {seconds:8.2f} s  {seconds / len(texts) * 1e6:8.1f} us/entry")
+
+
+if __name__ == "__main__":
+    main()
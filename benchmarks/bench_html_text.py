@@ -0,0 +1,77 @@
+"""Microbenchmark for summary HTML stripping
+
+Usage:
+    python -m benchmarks.bench_html_text --record   # capture summaries from the default feeds
+    python -m benchmarks.bench_html_text            # benchmark against the captured corpus
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.html_text import html_to_text
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "feed_summaries.json")
+
+
+def record_corpus(path):
+    """Capture raw entry summaries from the default feeds into a JSON corpus"""
+    import feedparser
+    import requests
+    from tools.http_client import USER_AGENT
+    from tools.news_fetcher_tool import DEFAULT_FEEDS
+
+    summaries = []
+    for url in DEFAULT_FEEDS:
+        response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=15)
+        feed = feedparser.parse(response.content)
+        for entry in feed.entries:
+            content = entry.get('content') or []
+            summaries.append(entry.get('summary') or (content[0].get('value') if content else '') or '')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summaries, f)
+    print(f"Recorded {len(summaries)} summaries to {path}")
+
+
+def whitespace_only(text):
+    """The previous behaviour: collapse whitespace and hard-truncate"""
+    text = ' '.join(text.split())
+    return text[:497] + "..." if len(text) > 500 else text
+
+
+def bs4_get_text(text):
+    from bs4 import BeautifulSoup
+    return ' '.join(BeautifulSoup(text, "html.parser").get_text(" ").split())[:500]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSON list of raw summaries")
+    parser.add_argument("--record", action="store_true", help="Capture a fresh corpus from the default feeds")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.record:
+        record_corpus(args.corpus)
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    candidates = {
+        "whitespace only (old)": whitespace_only,
+        "html_to_text": lambda text: html_to_text(text, max_chars=500),
+        "bs4 html.parser": bs4_get_text,
+    }
+    total_chars = sum(len(text) for text in corpus)
+    print(f"Corpus: {len(corpus)} summaries, {total_chars} chars")
+    for name, func in candidates.items():
+        seconds = min(timeit.repeat(lambda: [func(text) for text in corpus], number=1, repeat=args.repeat))
+        output_chars = sum(len(func(text)) for text in corpus)
+        print(f"{name:24s} {seconds * 1e6 / len(corpus):8.1f} us/summary  {output_chars:8d} output chars")
+
+
+if __name__ == "__main__":
+    main()
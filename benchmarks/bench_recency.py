@@ -0,0 +1,63 @@
+"""Benchmark the batch recency filter against the old per-entry check
+
+Usage:
+    python -m benchmarks.bench_recency [--entries 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.recency import filter_recent, recency_cutoff
+
+
+def old_is_recent(entry):
+    """The previous per-entry check: datetime.now() and time.mktime for every entry"""
+    try:
+        published = entry.get('published_parsed') or entry.get('updated_parsed')
+        if not published:
+            return True
+        entry_date = datetime.fromtimestamp(time.mktime(published), tz=timezone.utc)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(hours=24)
+        return entry_date >= cutoff_date
+    except Exception:
+        return True
+
+
+def synthetic_entries(count, seed=0):
+    """Entries spread over the last 72 hours, 5% without a date"""
+    rng = random.Random(seed)
+    now = time.time()
+    entries = []
+    for _ in range(count):
+        if rng.random() < 0.05:
+            entries.append({'title': 'undated'})
+        else:
+            entries.append({'published_parsed': time.gmtime(now - rng.uniform(0, 72 * 3600))})
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.entries)
+    candidates = {
+        "per-entry _is_recent (old)": lambda: [e for e in entries if old_is_recent(e)],
+        "filter_recent": lambda: filter_recent(entries, recency_cutoff(24)),
+    }
+    print(f"{len(entries)} synthetic entries")
+    for name, func in candidates.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{name:28s} {seconds * 1000:8.1f} ms  {len(func()):7d} kept")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Reproducible fetch pipeline benchmark against recorded feeds
+
+Feeds are recorded once (or synthesized) into a fixture directory and then
+replayed offline under simulated network profiles, so throughput and
+latency numbers don't depend on the live sites.
+
+Usage:
+    python -m benchmarks.bench_replay --record                 # capture the default feeds
+    python -m benchmarks.bench_replay --synthesize 200         # or generate synthetic feeds
+    python -m benchmarks.bench_replay [--profiles instant typical flaky] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_sharding import synthetic_feed
+from tools.feed_replay import REPLAY_PROFILES, FeedFixtures
+from tools.news_fetcher_tool import DEFAULT_FEEDS, RSSNewsFetcherTool
+
+DEFAULT_FIXTURES = os.path.join(".cache", "replay")
+# Recorded entries age, so replays consider every entry recent
+REPLAY_RECENCY_HOURS = 24 * 365 * 100
+
+
+def make_tool(args, **kwargs):
+    return RSSNewsFetcherTool(
+        feeds=kwargs.pop("feeds"), replay_dir=args.fixtures, max_workers=args.workers, fetch_deadline=600,
+        recency_hours=REPLAY_RECENCY_HOURS, cache_dir=None, seen_db_path=None, schedule_state_path=None, health_state_path=None,
+        breaker_failure_threshold=1_000_000, **kwargs,
+    )
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))] if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--record", action="store_true", help="Record the default feeds into the fixture directory")
+    parser.add_argument("--synthesize", type=int, metavar="N", help="Write N synthetic feeds into the fixture directory")
+    parser.add_argument("--profiles", nargs="+", default=["instant", "typical", "flaky"], choices=sorted(REPLAY_PROFILES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    fixtures = FeedFixtures(args.fixtures)
+    if args.record:
+        make_tool(args, feeds=list(DEFAULT_FEEDS), replay_mode="record").fetch_entries()
+        print(f"Recorded {len(fixtures.urls())} feeds into {args.fixtures}")
+        return
+    if args.synthesize:
+        for i in range(args.synthesize):
+            fixtures.save(f"https://feed{i}.bench.invalid/rss", 200, {"Content-Type": "application/rss+xml"}, synthetic_feed(i, 40))
+        print(f"Wrote {args.synthesize} synthetic feeds into {args.fixtures}")
+        return
+
+    feeds = fixtures.urls()
+    if not feeds:
+        parser.error(f"No recorded feeds in {args.fixtures}; run with --record or --synthesize first")
+
+    print(f"{len(feeds)} recorded feeds, {args.workers} workers, {args.runs} runs per profile")
+    print(f"{'profile':<8} {'wall s':>7} {'feeds/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'failed':>6}")
+    for name in args.profiles:
+        walls, latencies, failed = [], [], 0
+        for _ in range(args.runs):
+            tool = make_tool(args, feeds=feeds, replay_mode="replay", replay_profile=name)
+            start = time.perf_counter()
+            tool.fetch_entries()
+            walls.append(time.perf_counter() - start)
+            records = [tool._get_health_tracker().get(url) for url in feeds]
+            latencies.extend(record.last_latency for record in records if record.last_latency is not None)
+            failed += sum(1 for record in records if record.consecutive_failures)
+        wall = statistics.median(walls)
+        print(f"{name:<8} {wall:7.2f} {len(feeds) / wall:8.1f} {percentile(latencies, 0.5) * 1000:7.0f} "
+              f"{percentile(latencies, 0.95) * 1000:7.0f} {failed / args.runs:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Scaling curve for multi-process feed fetching
+
+Serves synthetic feeds from a local HTTP server and runs
+RSSNewsFetcherTool.fetch_entries with 1..N worker processes. The fetch and
+normalize phase, which sharding parallelizes, is timed apart from the merge
+phase in the parent (deduplication, ranking and selection), which it doesn't.
+
+Usage:
+    python -m benchmarks.bench_sharding [--feeds 500] [--entries 40] [--max-workers 8]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.news_fetcher_tool import RSSNewsFetcherTool
+
+fetch_seconds = [0.0]
+
+
+class TimedFetcher(RSSNewsFetcherTool):
+    """Fetcher that records the time spent fetching and normalizing feeds in the parent process"""
+
+    def _timed(self, collect, feeds, cutoff):
+        start = time.perf_counter()
+        try:
+            return collect(feeds, cutoff)
+        finally:
+            fetch_seconds[0] += time.perf_counter() - start
+
+    def _collect_feeds(self, feeds, cutoff):
+        return self._timed(super()._collect_feeds, feeds, cutoff)
+
+    def _collect_feeds_sharded(self, feeds, cutoff):
+        return self._timed(super()._collect_feeds_sharded, feeds, cutoff)
+
+
+VOCABULARY = """
+cloud security startup funding model chip battery launch privacy court ruling outage browser update
+robot satellite merger layoffs lawsuit smartphone console streaming network quantum encryption vehicle
+drone patent subscription regulator antitrust datacenter processor benchmark vulnerability breach
+""".split()
+
+
+def synthetic_feed(index, entries):
+    """An RSS document with distinct HTML summaries, published just now"""
+    rng = random.Random(index)
+    pub_date = format_datetime(datetime.now(timezone.utc))
+    items = "".join(
+        f"<item><title>{' '.join(rng.sample(VOCABULARY, 6)).capitalize()}</title>"
+        f"<link>https://example.com/{index}/{i}</link><guid>{index}-{i}</guid>"
+        f"<description>&lt;p&gt;{' '.join(rng.sample(VOCABULARY, 12))}. &lt;a href='#'&gt;Read more&lt;/a&gt; about the "
+        f"latest release, its pricing &amp;amp; availability.&lt;/p&gt;&lt;img src='https://pixel/{i}' width='1'/&gt;</description>"
+        f"<pubDate>{pub_date}</pubDate></item>"
+        for i in range(entries)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {index}</title>{items}</channel></rss>'.encode("utf-8")
+
+
+def serve(bodies):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = bodies[int(self.path.strip("/"))]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", type=int, default=500)
+    parser.add_argument("--entries", type=int, default=40, help="Entries per feed")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    bodies = [synthetic_feed(i, args.entries) for i in range(args.feeds)]
+    server = serve(bodies)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    feeds = [f"{base}/{i}" for i in range(args.feeds)]
+
+    print(f"{args.feeds} feeds x {args.entries} entries, {os.cpu_count()} CPUs")
+    print(f"{'processes':>9} {'total':>9} {'fetch':>9} {'merge':>9} {'fetch speedup':>14}")
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        tool = TimedFetcher(
+            feeds=feeds, process_workers=workers, max_workers=16, fetch_deadline=600,
+            cache_dir=None, seen_db_path=None, schedule_state_path=None, health_state_path=None,
+        )
+        fetch_seconds[0] = 0.0
+        start = time.perf_counter()
+        tool.fetch_entries()
+        total = time.perf_counter() - start
+        fetch = fetch_seconds[0]
+        baseline = baseline or fetch
+        print(f"{workers:9d} {total:8.2f}s {fetch:8.2f}s {total - fetch:8.2f}s {baseline / fetch:13.2f}x")
+        workers *= 2
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
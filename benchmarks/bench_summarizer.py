@@ -0,0 +1,69 @@
+"""Tokens saved versus quality lost by extractive pre-summarization
+
+Cuts each article of a corpus to K sentences with each summary method (the
+first K sentences, and the K most central by TextRank), and reports the estimated prompt tokens
+and ROUGE-1 recall against hand-written reference highlights.
+
+Usage:
+    python -m benchmarks.bench_summarizer [--corpus benchmarks/data/articles.json] [--sentences 2 3 4 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.extractive_summary import SUMMARIZERS
+from tools.text import tokenize
+from tools.token_budget import estimate_tokens
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "articles.json")
+
+
+def rouge1_recall(candidate, reference):
+    """Share of reference content words (with multiplicity) that the candidate contains"""
+    remaining = {}
+    for word in tokenize(candidate):
+        remaining[word] = remaining.get(word, 0) + 1
+    hits = 0
+    reference_words = tokenize(reference)
+    for word in reference_words:
+        if remaining.get(word):
+            remaining[word] -= 1
+            hits += 1
+    return hits / len(reference_words) if reference_words else 1.0
+
+
+def evaluate(articles, summarize):
+    tokens = recall = 0.0
+    start = time.perf_counter()
+    for article in articles:
+        summary = summarize(article["text"])
+        tokens += estimate_tokens(summary)
+        recall += rouge1_recall(summary, " ".join(article["highlights"]))
+    elapsed = (time.perf_counter() - start) / len(articles) * 1000
+    return tokens, recall / len(articles), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--sentences", type=int, nargs="+", default=[2, 3, 4, 5])
+    args = parser.parse_args()
+
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        articles = json.load(f)
+
+    full_tokens, full_recall, _ = evaluate(articles, lambda text: text)
+    print(f"{len(articles)} articles, {full_tokens:.0f} tokens in full, ROUGE-1 recall {full_recall:.3f}")
+    print(f"{'method':<12} {'tokens':>7} {'saved':>6} {'recall':>7} {'ms/article':>11}")
+    for k in args.sentences:
+        for method, summarize in SUMMARIZERS.items():
+            tokens, recall, elapsed = evaluate(articles, lambda text: summarize(text, k))
+            print(f"{method + '-' + str(k):<12} {tokens:7.0f} {1 - tokens / full_tokens:6.1%} {recall:7.3f} {elapsed:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
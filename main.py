@@ -24,7 +24,7 @@ def verify_environment():
 def create_agents(llm):
     """Create and return all agents with their tools"""
     logger.info("Initializing tools...")
-    news_tool = RSSNewsFetcherTool()
+    news_tool = RSSNewsFetcherTool(group_topics=True)
     wordpress_poster = WordPressPosterTool()
     
     logger.info("Creating agents...")
@@ -79,7 +79,8 @@ def create_tasks(fetcher, summarizer, writer, poster):
         - AI and ML developments
         - Cybersecurity news
         
-        Format your output as a clear list of news items with titles and summaries.
+        Format your output as a clear list of news items with titles and summaries,
+        keeping the themes the tool grouped them into.
         Ensure your output is properly formatted and complete before finishing.""",
         expected_output="A list of current tech news articles with titles and summaries",
         agent=fetcher,
@@ -92,7 +93,8 @@ def create_tasks(fetcher, summarizer, writer, poster):
         description="""Take the news articles from the previous task and create bullet-point summaries.
 
         Previous task output format:
-        A list of news items with Title, Link, and Summary sections.
+        News items grouped into themes. Each theme starts with a Theme line and a Key headline,
+        followed by its news items with Title, Link, and Summary sections.
 
         Your task:
         Create bullet-point summaries for each news article focusing on:
@@ -101,7 +103,7 @@ def create_tasks(fetcher, summarizer, writer, poster):
         - Main announcements
         - Critical insights
         
-        Format each summary as clear bullet points for easy reading.""",
+        Keep the theme grouping and format each summary as clear bullet points for easy reading.""",
         expected_output="A well-organized list of bullet-point summaries for each news article",
         agent=summarizer,
         context=[fetch_task]  # Pass the fetch task as context
@@ -120,7 +122,7 @@ def create_tasks(fetcher, summarizer, writer, poster):
         
         In the blog post content, include:
         - A compelling introduction
-        - Organized content by themes
+        - Content organized by the themes of the summaries
         - Technological implications
         - Industry analysis
         - Future predictions
@@ -235,6 +237,11 @@ def main():
         # Execute the workflow with retry logic
         logger.info("Starting the blog creation workflow...")
         result = run_with_retry(crew, max_retries=3)
+
+        # Only now are the fetched stories done with; a failed run leaves them for the next one
+        for tool in fetcher.tools:
+            if isinstance(tool, RSSNewsFetcherTool):
+                tool.mark_processed()
         
         # Process completed successfully
         execution_time = time.time() - start_time
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+import responses
+from tools.article_cache import ArticleCache
+from tools.article_extractor import ArticleExtractor, HostThrottle, decode_html, extract_main_text
+
+ARTICLE_HTML = """
+<html><head><title>Story</title><script>var tracking = "nope";</script></head>
+<body>
+  <nav><ul><li><a href="/">Home</a></li><li><a href="/tech">Tech</a></li></ul></nav>
+  <div class="layout">
+    <div class="article-body">
+      <h1>Chipmaker unveils new processor</h1>
+      <p>The company announced its next processor on Tuesday, promising faster inference, lower power draw and wider availability.</p>
+      <p>Analysts said the launch, long expected, puts pressure on rivals, who have struggled with supply constraints this year.</p>
+      <p>Shipments begin next quarter, with cloud providers first in line, followed by laptop makers in the spring.</p>
+    </div>
+    <div class="sidebar"><p>Subscribe to our newsletter for daily updates, deals, and more great stories.</p></div>
+  </div>
+  <div id="comments"><p>First! This is a comment that should not end up in the article text, obviously.</p></div>
+  <footer><p>Copyright 2026 Example Media, all rights reserved, worldwide.</p></footer>
+</body></html>
+"""
+
+
+def test_extract_main_text_keeps_article_body_only():
+    text = extract_main_text(ARTICLE_HTML)
+
+    assert text.startswith("The company announced its next processor on Tuesday")
+    assert "Shipments begin next quarter" in text
+    for boilerplate in ("Home", "newsletter", "First!", "Copyright", "tracking"):
+        assert boilerplate not in text
+
+def test_extract_main_text_falls_back_to_visible_text():
+    html = "<html><body><div>Short page<br>without paragraphs</div><script>x()</script></body></html>"
+
+    assert extract_main_text(html) == "Short page without paragraphs"
+
+def test_extract_main_text_truncates():
+    text = extract_main_text(ARTICLE_HTML, max_chars=60)
+
+    assert len(text) <= 60
+    assert text.endswith("...")
+
+def test_decode_html_uses_meta_charset():
+    body = '<html><head><meta charset="iso-8859-1"></head><body><p>Café</p></body></html>'.encode("iso-8859-1")
+
+    assert "Café" in decode_html(body, "text/html")
+    assert "Café" in decode_html("Café".encode("utf-8"), "text/html; charset=utf-8")
+
+@responses.activate
+def test_extracted_articles_are_cached(tmp_path):
+    url = "https://news.example.com/story"
+    responses.add(responses.GET, url, body=ARTICLE_HTML, status=200, content_type="text/html")
+    responses.add(responses.GET, "https://news.example.com/missing", status=404)
+
+    extractor = ArticleExtractor(cache=ArticleCache(str(tmp_path)), host_delay=0)
+    texts = extractor.extract_many([url, "https://news.example.com/missing"])
+    again = ArticleExtractor(cache=ArticleCache(str(tmp_path)), host_delay=0).extract(url)
+
+    assert list(texts) == [url]
+    assert again == texts[url]
+    assert len(responses.calls) == 2
+
+def test_stale_articles_are_evicted_when_the_cache_is_opened(tmp_path):
+    cache = ArticleCache(str(tmp_path), max_age=3600)
+    cache.set("https://news.example.com/old", "old text")
+    cache.set("https://news.example.com/new", "new text")
+    old_path = cache._path("https://news.example.com/old")
+    os.utime(old_path, (time.time() - 7200, time.time() - 7200))
+
+    reopened = ArticleCache(str(tmp_path), max_age=3600)
+
+    assert not os.path.exists(old_path)
+    assert reopened.get("https://news.example.com/new") == "new text"
+    assert ArticleCache(str(tmp_path)).evict_expired() == 0
+
+def test_host_throttle_spaces_requests_to_the_same_host():
+    throttle = HostThrottle(max_concurrent=2, min_interval=0.1)
+    starts = {}
+
+    def request(url):
+        with throttle.slot(url):
+            starts.setdefault(url.split("/")[2], []).append(time.monotonic())
+
+    threads = [threading.Thread(target=request, args=(url,)) for url in ["https://a.example.com/1", "https://a.example.com/2", "https://a.example.com/3", "https://b.example.com/1"]]
+    begin = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    same_host = sorted(starts["a.example.com"])
+    assert all(later - earlier >= 0.09 for earlier, later in zip(same_host, same_host[1:]))
+    assert starts["b.example.com"][0] - begin < 0.09
@@ -0,0 +1,29 @@
+import json
+import os
+import pytest
+from tools.atomic_file import write_atomic, write_json_atomic
+
+
+def test_write_replaces_file_and_creates_directories(tmp_path):
+    path = tmp_path / "state" / "schedule.json"
+    write_json_atomic(str(path), {"a": 1})
+    write_json_atomic(str(path), {"a": 2})
+    write_atomic(str(tmp_path / "body.bin"), b"\x00raw")
+
+    assert json.loads(path.read_text()) == {"a": 2}
+    assert (tmp_path / "body.bin").read_bytes() == b"\x00raw"
+    assert os.listdir(path.parent) == ["schedule.json"]
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / "state.json"
+    write_json_atomic(str(path), {"kept": True})
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        write_json_atomic(str(path), {"kept": False})
+
+    assert os.listdir(tmp_path) == ["state.json"]
+    assert json.loads(path.read_text()) == {"kept": True}
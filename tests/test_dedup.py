@@ -0,0 +1,43 @@
+from tools.dedup import NearDuplicateDetector, shingles
+
+
+def test_shingles_ignore_case_and_stopwords():
+    assert shingles("The OpenAI model is HERE") == {"openai", "model", "here"}
+    assert shingles("alpha beta gamma", size=2) == {"alpha beta", "beta gamma"}
+    assert shingles("alpha beta\ngamma", size=2) == {"alpha beta", "gamma"}
+
+def test_cluster_groups_near_duplicates_in_order():
+    texts = [
+        "OpenAI launches GPT-5 model with improved reasoning for developers",
+        "Apple unveils new MacBook Pro lineup with M5 chips",
+        "OpenAI launches GPT-5 model, promising improved reasoning for developers",
+        "Microsoft patches critical Exchange vulnerability exploited in the wild",
+    ]
+    clusters = NearDuplicateDetector(threshold=0.5).cluster(texts)
+
+    assert clusters == [[0, 2], [1], [3]]
+
+def test_same_topic_different_stories_stay_apart():
+    texts = [
+        "Microsoft patches Windows zero-day exploited in attacks Microsoft released an emergency update "
+        "fixing a Windows vulnerability exploited by attackers.",
+        "Microsoft patches Exchange zero-day exploited in attacks Microsoft released an emergency update "
+        "fixing an Exchange vulnerability exploited by attackers.",
+        "Microsoft patches Windows zero-day exploited in the wild Microsoft released an emergency update "
+        "fixing a Windows vulnerability exploited by attackers, the company said.",
+    ]
+    clusters = NearDuplicateDetector().cluster(texts)
+
+    assert clusters == [[0, 2], [1]]
+
+def test_empty_texts_are_never_duplicates():
+    clusters = NearDuplicateDetector().cluster(["", "", "something"])
+
+    assert clusters == [[0], [1], [2]]
+
+def test_large_duplicate_group_forms_one_cluster():
+    texts = [f"Breaking: datacenter outage takes down cloud region {i % 2}" for i in range(2000)]
+
+    clusters = NearDuplicateDetector(threshold=0.5).cluster(texts)
+
+    assert clusters == [list(range(2000))]
@@ -0,0 +1,48 @@
+import pytest
+from tools.extractive_summary import split_sentences, summarize_extractive, summarize_lead, textrank_scores
+
+ARTICLE = (
+    "Northwind unveiled a low-power AI processor for data centers on Tuesday. "
+    "The event took place in a converted warehouse downtown. "
+    "The AI processor runs data center inference at half the power of the previous processor. "
+    "Lunch was served afterwards. "
+    "Cloud providers will get the AI processor for their data centers next quarter."
+)
+
+
+def test_split_sentences_keeps_abbreviations_together():
+    text = 'The U.S. Senate met on Tuesday. Apple Inc. said revenue grew 5.2%. "It is big," he said. Dr. Smith agreed! e.g. this stays.'
+
+    assert split_sentences(text) == [
+        "The U.S. Senate met on Tuesday.",
+        "Apple Inc. said revenue grew 5.2%.",
+        '"It is big," he said.',
+        "Dr. Smith agreed! e.g. this stays.",
+    ]
+
+def test_textrank_prefers_central_sentences():
+    scores = textrank_scores([["chip", "power"], ["chip", "power", "cloud"], ["lunch"], ["cloud", "chip"]])
+
+    assert scores[2] == min(scores)
+    assert scores[1] == max(scores)
+
+def test_summary_keeps_best_sentences_in_order():
+    summary = summarize_extractive(ARTICLE, 3)
+
+    assert summary == (
+        "Northwind unveiled a low-power AI processor for data centers on Tuesday. "
+        "The AI processor runs data center inference at half the power of the previous processor. "
+        "Cloud providers will get the AI processor for their data centers next quarter."
+    )
+
+def test_lead_summary_keeps_first_sentences():
+    assert summarize_lead(ARTICLE, 2) == (
+        "Northwind unveiled a low-power AI processor for data centers on Tuesday. "
+        "The event took place in a converted warehouse downtown."
+    )
+
+@pytest.mark.parametrize("summarize", [summarize_extractive, summarize_lead])
+def test_short_text_is_unchanged(summarize):
+    assert summarize("One sentence. Two sentences.", 2) == "One sentence. Two sentences."
+    with pytest.raises(ValueError):
+        summarize(ARTICLE, 0)
@@ -0,0 +1,36 @@
+from tools.feed_health import FeedHealthTracker
+
+
+def test_circuit_opens_after_threshold_and_backs_off(tmp_path):
+    tracker = FeedHealthTracker(failure_threshold=2, base_cooldown=100, max_cooldown=300)
+    url = "https://dead.example.com/rss"
+
+    tracker.record_failure(url, "timeout", now=0)
+    assert tracker.allow_request(url, now=1)
+
+    tracker.record_failure(url, "timeout", now=10)
+    assert not tracker.allow_request(url, now=50)
+    # Half-open once the cooldown expires
+    assert tracker.allow_request(url, now=110)
+
+    tracker.record_failure(url, "timeout", now=110)
+    assert tracker.get(url).open_until == 110 + 200
+    tracker.record_failure(url, "timeout", now=400)
+    assert tracker.get(url).open_until == 400 + 300
+
+def test_successful_probe_closes_circuit_and_state_persists(tmp_path):
+    state_path = str(tmp_path / "health.json")
+    url = "https://flaky.example.com/rss"
+    tracker = FeedHealthTracker(state_path, failure_threshold=1, base_cooldown=100)
+    tracker.record_failure(url, "bad xml", now=0)
+    tracker.save()
+
+    restored = FeedHealthTracker(state_path, failure_threshold=1, base_cooldown=100)
+    assert not restored.allow_request(url, now=50)
+    restored.record_success(url, latency=0.25, now=150)
+
+    record = restored.get(url)
+    assert record.consecutive_failures == 0
+    assert record.open_until is None
+    assert record.last_latency == 0.25
+    assert restored.allow_request(url, now=151)
@@ -0,0 +1,96 @@
+import json
+import pytest
+from tools.feed_registry import FeedConfig, FeedScheduler, load_feed_registry
+
+
+def write_registry(tmp_path, data, name="feeds.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(data))
+    return str(path)
+
+def test_load_registry(tmp_path):
+    path = write_registry(tmp_path, {"feeds": [
+        {"url": "https://a.example.com/rss", "poll_interval": 1800, "max_items": 5, "weight": 2.0},
+        {"url": "https://b.example.com/rss", "enabled": False, "timeout": 3},
+    ]})
+    configs = load_feed_registry(path)
+
+    assert configs[0] == FeedConfig(url="https://a.example.com/rss", poll_interval=1800, max_items=5, weight=2.0)
+    assert configs[1].enabled is False
+    assert configs[1].timeout == 3
+
+def test_load_yaml_registry(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "feeds.yaml"
+    path.write_text("feeds:\n  - url: https://a.example.com/rss\n    poll_interval: 600\n")
+
+    assert load_feed_registry(str(path)) == [FeedConfig(url="https://a.example.com/rss", poll_interval=600)]
+
+@pytest.mark.parametrize("data, message", [
+    ([{"url": "https://a", "interval": 5}], "Unknown feed registry keys"),
+    ([{"name": "no url"}], "missing 'url'"),
+    ([{"url": "https://a"}, {"url": "https://a"}], "duplicate URLs"),
+    ({"feeds": "https://a"}, "must contain a list"),
+])
+def test_invalid_registry(tmp_path, data, message):
+    with pytest.raises(ValueError) as exc_info:
+        load_feed_registry(write_registry(tmp_path, data))
+    assert message in str(exc_info.value)
+
+def test_scheduler_only_returns_due_feeds(tmp_path):
+    state_path = str(tmp_path / "schedule.json")
+    hourly = FeedConfig(url="https://hourly", poll_interval=3600)
+    always = FeedConfig(url="https://always")
+    disabled = FeedConfig(url="https://disabled", enabled=False)
+
+    scheduler = FeedScheduler(state_path)
+    assert scheduler.due_feeds([hourly, always, disabled], now=1000) == [hourly, always]
+    scheduler.mark_polled(["https://hourly", "https://always"], now=1000)
+
+    restored = FeedScheduler(state_path)
+    assert restored.due_feeds([hourly, always], now=2000) == [always]
+    assert restored.due_feeds([hourly, always], now=1000 + 3600) == [hourly, always]
+
+def test_adaptive_interval_backs_off_quiet_feeds(tmp_path):
+    config = FeedConfig(url="https://quiet", poll_interval=3600)
+    scheduler = FeedScheduler(adaptive=True, min_interval=900, max_interval=8000)
+    scheduler.mark_polled([config.url], now=10_000)
+
+    assert scheduler.learn(config, [], not_modified=True) == 5400
+    assert scheduler.learn(config, [5_000.0]) == 8000  # Nothing newer than the last poll
+    assert scheduler.interval_for(config) == 8000
+
+def test_adaptive_interval_tracks_publishing_cadence(tmp_path):
+    state_path = str(tmp_path / "schedule.json")
+    config = FeedConfig(url="https://hot", poll_interval=3600)
+    scheduler = FeedScheduler(state_path, adaptive=True, min_interval=300, max_interval=86400)
+    # A new entry every 10 minutes
+    entry_times = [float(t) for t in range(0, 6000, 600)]
+
+    interval = scheduler.learn(config, entry_times)
+    scheduler.mark_polled([config.url], now=6000)
+
+    assert interval == 3600 + 0.5 * (300 - 3600)
+    restored = FeedScheduler(state_path, adaptive=True, min_interval=300, max_interval=86400)
+    assert restored.interval_for(config) == interval
+    assert not restored.is_due(config, now=6000 + 1000)
+    assert restored.is_due(config, now=6000 + interval)
+
+def test_load_opml_flattens_folders_and_drops_duplicates(tmp_path):
+    path = tmp_path / "feeds.opml"
+    path.write_text("""<?xml version="1.0"?>
+<opml version="2.0"><head><title>Tech</title></head><body>
+  <outline text="News">
+    <outline text="TechCrunch" type="rss" xmlUrl="https://techcrunch.com/feed/"/>
+    <outline text="Security"><outline title="Krebs" xmlUrl="https://krebsonsecurity.com/feed/"/></outline>
+  </outline>
+  <outline text="TechCrunch again" xmlUrl="https://techcrunch.com/feed/"/>
+  <outline text="Folder without feed"/>
+</body></opml>""")
+
+    configs = load_feed_registry(str(path))
+
+    assert [(c.url, c.name) for c in configs] == [
+        ("https://techcrunch.com/feed/", "TechCrunch"),
+        ("https://krebsonsecurity.com/feed/", "Krebs"),
+    ]
@@ -0,0 +1,54 @@
+import time
+import pytest
+import requests
+import responses
+from tools.feed_replay import FeedFixtures, ReplayProfile, recording_session, replay_session
+
+RSS = b'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title></channel></rss>'
+
+
+@responses.activate
+def test_recorded_responses_are_replayed(tmp_path):
+    url = "https://feeds.example.com/rss"
+    responses.add(responses.GET, url, body=RSS, status=200, content_type="application/rss+xml", headers={"ETag": '"v1"'})
+
+    recorded = recording_session(str(tmp_path)).get(url, stream=True)
+    assert b"".join(recorded.iter_content(16)) == RSS
+
+    responses.reset()
+    replayed = replay_session(str(tmp_path)).get(url)
+    not_modified = replay_session(str(tmp_path)).get(url, headers={"If-None-Match": '"v1"'})
+
+    assert replayed.status_code == 200
+    assert replayed.content == RSS
+    assert replayed.headers["Content-Type"] == "application/rss+xml"
+    assert not_modified.status_code == 304
+
+def test_missing_fixture_fails_like_the_network(tmp_path):
+    with pytest.raises(requests.ConnectionError):
+        replay_session(str(tmp_path)).get("https://unknown.example.com/rss")
+
+def test_replay_profile_simulates_latency_and_failures(tmp_path):
+    urls = [f"https://feed{i}.example.com/rss" for i in range(40)]
+    for url in urls:
+        FeedFixtures(str(tmp_path)).save(url, 200, {"Content-Type": "application/rss+xml"}, RSS)
+
+    def outcomes(seed):
+        session = replay_session(str(tmp_path), ReplayProfile(failure_rate=0.25, error_rate=0.25), seed=seed)
+        results = []
+        for url in urls:
+            try:
+                results.append(session.get(url).status_code)
+            except requests.ConnectionError:
+                results.append("failed")
+        return results
+
+    first = outcomes(seed=1)
+    assert first == outcomes(seed=1)
+    assert {"failed", 503, 200} <= set(first)
+
+    start = time.monotonic()
+    replay_session(str(tmp_path), ReplayProfile(latency=0.05)).get(urls[0])
+    assert time.monotonic() - start >= 0.05
+    with pytest.raises(requests.Timeout):
+        replay_session(str(tmp_path), ReplayProfile(latency=1.0)).get(urls[0], timeout=0.05)
@@ -0,0 +1,24 @@
+from tools.html_text import html_to_text, truncate_words
+
+
+def test_html_to_text_strips_markup_and_decodes_entities():
+    html = (
+        '<p>Apple&#8217;s new <a href="https://x">chip</a> &amp; more</p>'
+        '<script>track()</script><style>p{}</style>'
+        '<img src="https://pixel.example.com/1x1.gif" width="1" height="1"/>'
+        '<p>Second&nbsp;paragraph</p>'
+    )
+
+    assert html_to_text(html) == "Apple’s new chip & more Second paragraph"
+
+def test_block_tags_separate_words():
+    assert html_to_text("<li>one</li><li>two</li>one<br>two") == "one two one two"
+
+def test_plain_text_fast_path_collapses_whitespace():
+    assert html_to_text("  plain\n text  ") == "plain text"
+
+def test_truncate_on_word_boundary():
+    assert truncate_words("alpha beta gamma", 100) == "alpha beta gamma"
+    assert truncate_words("alpha beta gamma", 13) == "alpha beta..."
+    assert truncate_words("alpha beta gamma", 12) == "alpha..."
+    assert len(html_to_text("<p>" + "word " * 500 + "</p>", max_chars=500)) <= 500
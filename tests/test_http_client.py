@@ -0,0 +1,32 @@
+import gzip
+import pytest
+import responses
+from tools.http_client import ResponseTooLarge, fetch, get_shared_session
+
+
+def test_shared_session_is_reused():
+    session = get_shared_session(max_connections_per_host=2)
+
+    assert get_shared_session(max_connections_per_host=2) is session
+    assert get_shared_session(max_connections_per_host=3) is not session
+    assert "gzip" in session.headers["Accept-Encoding"]
+
+@responses.activate
+def test_fetch_decodes_compressed_body():
+    body = b"<rss></rss>" * 100
+    responses.add(
+        responses.GET, "https://example.com/rss", body=gzip.compress(body), status=200,
+        headers={"Content-Encoding": "gzip", "ETag": '"abc"'}
+    )
+
+    response = fetch(get_shared_session(), "https://example.com/rss", timeout=5)
+
+    assert response.content == body
+    assert response.headers["etag"] == '"abc"'
+
+@responses.activate
+def test_fetch_rejects_oversized_body():
+    responses.add(responses.GET, "https://example.com/huge", body=b"x" * 2048, status=200)
+
+    with pytest.raises(ResponseTooLarge):
+        fetch(get_shared_session(), "https://example.com/huge", max_bytes=1024)
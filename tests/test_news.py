@@ -6,7 +6,8 @@ logger = setup_logger()
 logger.info("Testing news fetcher directly")
 
 try:
-    news_tool = RSSNewsFetcherTool()
+    # Keep the production state in .cache/ untouched
+    news_tool = RSSNewsFetcherTool(cache_dir=None, seen_db_path=None, schedule_state_path=None, health_state_path=None)
     result = news_tool._run("")
     
     news_items = result.split("\n---\n")
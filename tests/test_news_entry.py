@@ -0,0 +1,35 @@
+import json
+import time
+from datetime import datetime, timezone
+from tools.news_entry import NewsEntry, render_json, render_text
+
+
+def test_from_feed_entry_normalizes_fields():
+    entry = {
+        "title": "  Big\n news  ",
+        "link": "https://example.com/a ",
+        "id": "guid-1",
+        "published_parsed": time.struct_time((2024, 5, 1, 12, 0, 0, 2, 122, 0)),
+    }
+    news = NewsEntry.from_feed_entry(entry, "https://example.com/rss", "Summary")
+
+    assert news.title == "Big news"
+    assert news.link == "https://example.com/a"
+    assert news.guid == "guid-1"
+    assert news.published == datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+def test_renderers():
+    entries = [
+        NewsEntry(title="A", link="https://a", summary="first", related_links=("https://b",)),
+        NewsEntry(title="C", link="https://c", summary="second"),
+    ]
+
+    assert render_text(entries) == (
+        "Title: A\nLink: https://a\nAlso covered by: https://b\nSummary: first\n"
+        "\n---\n"
+        "Title: C\nLink: https://c\nSummary: second\n"
+    )
+    assert json.loads(render_json(entries)) == [
+        {"title": "A", "link": "https://a", "summary": "first", "related_links": ["https://b"]},
+        {"title": "C", "link": "https://c", "summary": "second"},
+    ]
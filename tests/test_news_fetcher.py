@@ -1,8 +1,17 @@
 import sys
 import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
+import requests
+import responses
+from responses import matchers
+from email.utils import format_datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tools.news_fetcher_tool import RSSNewsFetcherTool
+from tools.token_budget import estimate_tokens
 from logger import setup_logger
 from datetime import datetime, timezone, timedelta
 import feedparser
@@ -22,7 +31,7 @@ def is_recent_date(date_str):
 def test_news_fetcher():
     logger.info("Starting News Fetcher Tool test")
 
-    news_tool = RSSNewsFetcherTool()
+    news_tool = RSSNewsFetcherTool(cache_dir=None, seen_db_path=None, schedule_state_path=None, health_state_path=None)
 
     logger.info("Executing news fetcher")
     result = news_tool._run("")
@@ -44,3 +53,325 @@ def test_news_fetcher():
         assert all(x in item for x in ["Title:", "Link:", "Summary:"]), "Missing required fields"
 
 
+def make_tool(**kwargs):
+    """Build a fetcher with on-disk state disabled unless a test opts in"""
+    kwargs.setdefault("cache_dir", None)
+    kwargs.setdefault("seen_db_path", None)
+    kwargs.setdefault("schedule_state_path", None)
+    kwargs.setdefault("health_state_path", None)
+    return RSSNewsFetcherTool(**kwargs)
+
+def make_rss(title, items):
+    """Build a minimal RSS document whose items were published just now"""
+    pub_date = format_datetime(datetime.now(timezone.utc))
+    body = "".join(
+        f"<item><title>{item}</title><link>https://example.com/{item}</link>"
+        f"<description>About {item}</description><pubDate>{pub_date}</pubDate></item>"
+        for item in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{title}</title>{body}</channel></rss>'
+
+@responses.activate
+def test_concurrent_fetch_keeps_feed_order():
+    feeds = [f"https://feed{i}.example.com/rss" for i in range(5)]
+    for i, url in enumerate(feeds):
+        responses.add(responses.GET, url, body=make_rss(f"feed{i}", [f"story-{i}"]), status=200, content_type="application/rss+xml")
+
+    tool = make_tool(feeds=feeds, max_workers=4)
+    result = tool._run("")
+
+    items = result.split("\n---\n")
+    assert [item.splitlines()[0] for item in items] == [f"Title: story-{i}" for i in range(5)]
+
+@responses.activate
+def test_failed_feed_does_not_block_others():
+    good = "https://good.example.com/rss"
+    bad = "https://bad.example.com/rss"
+    responses.add(responses.GET, bad, body=requests.ConnectionError("refused"))
+    responses.add(responses.GET, good, body=make_rss("good", ["ok"]), status=200, content_type="application/rss+xml")
+
+    tool = make_tool(feeds=[bad, good])
+    result = tool._run("")
+
+    assert "Title: ok" in result
+
+def test_fetch_deadline_skips_slow_feeds(monkeypatch):
+    tool = make_tool(feeds=["https://slow.example.com/rss", "https://fast.example.com/rss"], fetch_deadline=0.2)
+
+    def fake_fetch(url):
+        if "slow" in url:
+            time.sleep(1)
+        return feedparser.parse(make_rss("fast", ["quick"]))
+
+    monkeypatch.setattr(RSSNewsFetcherTool, "_fetch_feed", lambda self, url, timeout=None: fake_fetch(url))
+
+    start = time.monotonic()
+    results = tool._fetch_feeds(tool._feed_configs())
+
+    assert time.monotonic() - start < 0.9
+    assert results[0] is None
+    assert results[1].entries[0].title == "quick"
+
+@responses.activate
+def test_not_modified_feed_served_from_cache(tmp_path):
+    url = "https://cached.example.com/rss"
+    responses.add(
+        responses.GET, url, body=make_rss("cached", ["first"]), status=200,
+        content_type="application/rss+xml", headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    )
+    responses.add(
+        responses.GET, url, status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})]
+    )
+
+    tool = make_tool(feeds=[url], cache_dir=str(tmp_path))
+    first = tool._run("")
+    second = make_tool(feeds=[url], cache_dir=str(tmp_path))._run("")
+
+    assert "Title: first" in first
+    assert second == first
+    assert len(responses.calls) == 2
+
+@responses.activate
+def test_seen_entries_are_skipped_on_next_run(tmp_path):
+    url = "https://seen.example.com/rss"
+    responses.add(responses.GET, url, body=make_rss("seen", ["old"]), status=200, content_type="application/rss+xml")
+    responses.add(responses.GET, url, body=make_rss("seen", ["old", "new"]), status=200, content_type="application/rss+xml")
+
+    db_path = str(tmp_path / "seen.sqlite3")
+    tool = make_tool(feeds=[url], seen_db_path=db_path)
+    first = tool._run("")
+    tool.mark_processed()
+    second = make_tool(feeds=[url], seen_db_path=db_path)._run("")
+
+    assert "Title: old" in first
+    assert "Title: new" in second
+    assert "Title: old" not in second
+
+@responses.activate
+def test_entries_stay_unseen_until_marked_processed(tmp_path):
+    url = "https://unseen.example.com/rss"
+    responses.add(responses.GET, url, body=make_rss("unseen", ["story"]), status=200, content_type="application/rss+xml")
+
+    db_path = str(tmp_path / "seen.sqlite3")
+    tool = make_tool(feeds=[url], seen_db_path=db_path)
+    first = tool._run("AI news")
+    again = tool._run("tech news")
+    # A crew run that failed before publishing never marks its items
+    after_failure = make_tool(feeds=[url], seen_db_path=db_path)._run("")
+
+    assert "Title: story" in first
+    assert again == first
+    assert after_failure == first
+    assert len(responses.calls) == 2
+
+@responses.activate
+def test_duplicate_stories_across_feeds_are_collapsed():
+    first = "https://first.example.com/rss"
+    second = "https://second.example.com/rss"
+    responses.add(responses.GET, first, body=make_rss("first", ["Acme-releases-quantum-chip-for-datacenters"]), status=200, content_type="application/rss+xml")
+    responses.add(responses.GET, second, body=make_rss("second", ["Acme-releases-quantum-chip-for-datacenters-today"]), status=200, content_type="application/rss+xml")
+
+    result = make_tool(feeds=[first, second])._run("")
+
+    assert len(result.split("\n---\n")) == 1
+    assert "Also covered by: https://example.com/Acme-releases-quantum-chip-for-datacenters-today" in result
+
+@responses.activate
+def test_json_output_format():
+    url = "https://json.example.com/rss"
+    responses.add(responses.GET, url, body=make_rss("json", ["structured"]), status=200, content_type="application/rss+xml")
+
+    result = json.loads(make_tool(feeds=[url], output_format="json")._run(""))
+
+    assert result[0]["title"] == "structured"
+    assert result[0]["link"] == "https://example.com/structured"
+    assert result[0]["source"] == url
+    assert "published" in result[0]
+
+@responses.activate
+def test_entries_are_ranked_globally_by_topic():
+    first = "https://lifestyle.example.com/rss"
+    second = "https://security.example.com/rss"
+    responses.add(responses.GET, first, body=make_rss("lifestyle", ["gardening-tips", "recipe-ideas"]), status=200, content_type="application/rss+xml")
+    responses.add(responses.GET, second, body=make_rss("security", ["ransomware-outbreak"]), status=200, content_type="application/rss+xml")
+
+    tool = make_tool(feeds=[first, second], topic_query="ransomware security", max_items=2)
+    titles = [entry.title for entry in tool.fetch_entries()]
+
+    assert titles == ["ransomware-outbreak", "gardening-tips"]
+
+@responses.activate
+def test_output_is_packed_into_token_budget():
+    url = "https://budget.example.com/rss"
+    responses.add(responses.GET, url, body=make_rss("budget", [f"story-{i}" for i in range(5)]), status=200, content_type="application/rss+xml")
+
+    tool = make_tool(feeds=[url], max_entries_per_feed=5, topic_query=None, token_budget=60)
+    result = tool._run("")
+
+    assert estimate_tokens(result) <= 60
+    assert 0 < len(result.split("\n---\n")) < 5
+
+@pytest.mark.parametrize("output_format", ["text", "json"])
+@responses.activate
+def test_grouped_output_fits_token_budget(output_format):
+    url = "https://grouped.example.com/rss"
+    titles = ["quantum-computing-breakthrough", "semiconductor-export-controls", "electric-vehicle-batteries", "satellite-internet-coverage", "biotech-protein-folding"]
+    responses.add(responses.GET, url, body=make_rss("grouped", titles), status=200, content_type="application/rss+xml")
+
+    tool = make_tool(feeds=[url], max_entries_per_feed=5, topic_query=None, dedup_threshold=None, group_topics=True, token_budget=150, output_format=output_format)
+    result = tool._run("")
+
+    assert estimate_tokens(result) <= 150
+    assert 0 < len(tool._pending) < 5
+
+@responses.activate
+def test_registry_feeds_are_fetched_when_due(tmp_path):
+    hourly = "https://hourly.example.com/rss"
+    disabled = "https://disabled.example.com/rss"
+    responses.add(responses.GET, hourly, body=make_rss("hourly", ["a", "b", "c"]), status=200, content_type="application/rss+xml")
+    registry = tmp_path / "feeds.json"
+    registry.write_text(json.dumps([
+        {"url": hourly, "poll_interval": 3600, "max_items": 2},
+        {"url": disabled, "enabled": False},
+    ]))
+
+    tool = make_tool(registry_path=str(registry), schedule_state_path=str(tmp_path / "schedule.json"), topic_query=None)
+    first = tool.fetch_entries()
+    second = tool.fetch_entries()
+
+    assert [entry.title for entry in first] == ["a", "b"]
+    assert second == []
+    assert len(responses.calls) == 1
+
+@responses.activate
+def test_failing_feed_is_skipped_while_circuit_is_open():
+    url = "https://broken.example.com/rss"
+    responses.add(responses.GET, url, body="<rss><channel><item>", status=200, content_type="application/rss+xml")
+
+    tool = make_tool(feeds=[url], breaker_failure_threshold=2)
+    tool.fetch_entries()
+    tool.fetch_entries()
+    tool.fetch_entries()
+
+    assert len(responses.calls) == 2
+    assert tool._get_health_tracker().get(url).consecutive_failures == 2
+
+@responses.activate
+def test_streaming_parse_mode():
+    url = "https://stream.example.com/rss"
+    responses.add(responses.GET, url, body=make_rss("stream", [f"s{i}" for i in range(10)]), status=200, content_type="application/rss+xml")
+
+    feed = make_tool(feeds=[url], streaming_parse=True, stream_entry_limit=4)._fetch_feed(url)
+
+    assert [entry.title for entry in feed.entries] == ["s0", "s1", "s2", "s3"]
+
+@responses.activate
+def test_selected_entries_get_article_text(tmp_path):
+    url = "https://articles.example.com/rss"
+    responses.add(responses.GET, url, body=make_rss("articles", ["full", "broken"]), status=200, content_type="application/rss+xml")
+    body = "<html><body><nav>Menu</nav><article><p>The full story, with details, quotes and context the feed summary leaves out.</p></article></body></html>"
+    responses.add(responses.GET, "https://example.com/full", body=body, status=200, content_type="text/html")
+    responses.add(responses.GET, "https://example.com/broken", status=500)
+
+    tool = make_tool(feeds=[url], topic_query=None, extract_articles=True, article_cache_dir=str(tmp_path), article_host_delay=0)
+    entries = {entry.title: entry for entry in tool.fetch_entries()}
+
+    assert entries["full"].content == "The full story, with details, quotes and context the feed summary leaves out."
+    assert entries["broken"].content is None
+    assert "Article: The full story" in entries["full"].render_text()
+
+
+@responses.activate
+def test_article_text_is_trimmed_to_token_budget(tmp_path):
+    url = "https://long.example.com/rss"
+    titles = [f"long-{i}" for i in range(5)]
+    responses.add(responses.GET, url, body=make_rss("long", titles), status=200, content_type="application/rss+xml")
+    paragraph = "<p>" + "The report covers the new system, its rollout, the costs and what analysts expect next. " * 40 + "</p>"
+    for title in titles:
+        responses.add(responses.GET, f"https://example.com/{title}", body=f"<html><body><article>{paragraph}</article></body></html>",
+                      status=200, content_type="text/html")
+
+    tool = make_tool(feeds=[url], topic_query=None, max_entries_per_feed=5, token_budget=600, extract_articles=True,
+                     article_cache_dir=str(tmp_path), article_host_delay=0)
+    result = tool._run("")
+
+    assert estimate_tokens(result) <= 600
+    assert len(result.split("\n---\n")) == 5
+    assert result.count("Article: ") >= 1  # Best-ranked items keep (part of) their article
+
+@pytest.fixture
+def feed_server():
+    """Serve make_rss documents from a local HTTP server, one per path"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            body = make_rss(path, [f"story{path.replace('/', '-')}"]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_sharded_fetch_merges_results_in_feed_order(feed_server, tmp_path):
+    feeds = [f"{feed_server}/feed{i}" for i in range(6)]
+    # The same feed listed twice must not produce the same story twice
+    feeds.append(feeds[0] + "?dup")
+
+    tool = make_tool(feeds=feeds, process_workers=3, topic_query=None, dedup_threshold=None, max_items=20, token_budget=None)
+    titles = [entry.title for entry in tool.fetch_entries()]
+
+    assert titles == [f"story-feed{i}" for i in range(6)]
+    assert all(tool._get_health_tracker().get(url).last_success for url in feeds)
+
+@responses.activate
+def test_summaries_are_condensed_to_top_sentences():
+    url = "https://long.example.com/rss"
+    pub_date = format_datetime(datetime.now(timezone.utc))
+    description = "Chip launch slashes AI power use. The venue was a warehouse. The chip cuts AI power use in half. Lunch followed."
+    body = (
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>long</title><item><title>chip</title>'
+        f"<link>https://example.com/chip</link><description>{description}</description><pubDate>{pub_date}</pubDate></item></channel></rss>"
+    )
+    responses.add(responses.GET, url, body=body, status=200, content_type="application/rss+xml")
+
+    lead = make_tool(feeds=[url], topic_query=None, summary_sentences=2).fetch_entries()
+    central = make_tool(feeds=[url], topic_query=None, summary_sentences=2, summary_method="textrank").fetch_entries()
+
+    assert lead[0].summary == "Chip launch slashes AI power use. The venue was a warehouse."
+    assert central[0].summary == "Chip launch slashes AI power use. The chip cuts AI power use in half."
+
+@responses.activate
+def test_output_grouped_by_topic():
+    first = "https://ai.example.com/rss"
+    second = "https://more-ai.example.com/rss"
+    responses.add(responses.GET, first, body=make_rss("ai", ["openai-gpt-model-launch", "macbook-laptop-review"]), status=200, content_type="application/rss+xml")
+    responses.add(responses.GET, second, body=make_rss("more", ["google-gemini-model-launch"]), status=200, content_type="application/rss+xml")
+
+    result = make_tool(feeds=[first, second], topic_query=None, dedup_threshold=None, group_topics=True)._run("")
+
+    themes = result.split("\n===\n")
+    assert len(themes) == 2
+    assert "Title: openai-gpt-model-launch" in themes[0] and "Title: google-gemini-model-launch" in themes[0]
+    assert themes[1].startswith("Theme: laptop, macbook, review (1 story)")
+
+@responses.activate
+def test_feeds_recorded_once_are_replayed_offline(tmp_path):
+    url = "https://record.example.com/rss"
+    responses.add(responses.GET, url, body=make_rss("record", ["captured"]), status=200, content_type="application/rss+xml")
+
+    recorded = make_tool(feeds=[url], replay_mode="record", replay_dir=str(tmp_path))._run("")
+    responses.reset()
+    replayed = make_tool(feeds=[url], replay_mode="replay", replay_dir=str(tmp_path))._run("")
+
+    assert "Title: captured" in recorded
+    assert replayed == recorded
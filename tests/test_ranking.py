@@ -0,0 +1,17 @@
+from tools.ranking import BM25Scorer
+
+
+def test_bm25_prefers_documents_matching_the_query():
+    docs = [
+        "Celebrity chef opens new restaurant downtown",
+        "Ransomware gang exploits critical vulnerability in VPN appliances",
+        "New machine learning model beats benchmark",
+    ]
+    scores = BM25Scorer("cybersecurity vulnerability ransomware machine learning").score(docs)
+
+    assert scores[0] == 0
+    assert scores[1] > 0 and scores[2] > 0
+
+def test_bm25_without_query_terms_scores_zero():
+    assert BM25Scorer("the and of").score(["anything here"]) == [0.0]
+    assert BM25Scorer("ai").score([]) == []
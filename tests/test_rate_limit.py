@@ -0,0 +1,73 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+from tools.rate_limit import MAX_RETRY_AFTER, RateLimiter, TokenBucket, get_rate_limiter, parse_retry_after
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_parse_retry_after_seconds_and_dates():
+    now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=30), usegmt=True), now=now) == 30.0
+    assert parse_retry_after(format_datetime(now - timedelta(seconds=30), usegmt=True), now=now) == 0.0
+    assert parse_retry_after("86400") == MAX_RETRY_AFTER
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10.0, capacity=3)
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
+
+def test_token_bucket_is_shared_by_threads():
+    bucket = TokenBucket(rate=20.0, capacity=1)
+    start = time.monotonic()
+
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 0.45  # Ten of the eleven requests are spaced 50 ms apart
+
+def test_throttling_pauses_slows_and_recovers():
+    limiter = RateLimiter(rate=10.0, burst=2)
+
+    delay = limiter.update("https://example.com/posts", Response(429, {"Retry-After": "2"}))
+    bucket = limiter.bucket("https://example.com/posts")
+
+    assert delay == pytest.approx(2.0, abs=0.05)
+    assert bucket.rate == 5.0
+    assert bucket.reserve() == pytest.approx(2.2, abs=0.05)
+    assert limiter.bucket("https://example.com/tags").reserve() == 0.0  # Other endpoints are unaffected
+
+    limiter.update("https://example.com/posts", Response(503))
+    assert bucket.rate == 2.5
+    for _ in range(10):
+        limiter.update("https://example.com/posts", Response(201))
+    assert bucket.rate == 10.0
+
+def test_endpoint_bucket_is_shared_across_settings():
+    limiter = get_rate_limiter()
+    bucket = limiter.bucket("https://shared.example.com/posts", rate=4.0, burst=2)
+    bucket.penalize(0.0)
+
+    reconfigured = limiter.bucket("https://shared.example.com/posts", rate=8.0, burst=3)
+
+    assert get_rate_limiter() is limiter
+    assert reconfigured is bucket
+    assert (bucket.max_rate, bucket.capacity) == (8.0, 3)
+    assert bucket.rate == 4.0  # Still backed off by half
@@ -0,0 +1,20 @@
+import time
+from tools.recency import entry_timestamp, filter_recent, recency_cutoff
+
+
+def test_entry_timestamp_treats_struct_time_as_utc():
+    entry = {"published_parsed": time.struct_time((2024, 1, 1, 0, 0, 0, 0, 1, 0))}
+
+    assert entry_timestamp(entry) == 1704067200.0
+    assert entry_timestamp({"updated_parsed": time.gmtime(100)}) == 100.0
+    assert entry_timestamp({}) is None
+
+def test_filter_recent_uses_window_and_keeps_undated_entries():
+    now = 1_000_000.0
+    fresh = {"published_parsed": time.gmtime(now - 3600)}
+    stale = {"published_parsed": time.gmtime(now - 3 * 3600)}
+    undated = {"title": "no date"}
+    entries = [fresh, stale, undated]
+
+    assert filter_recent(entries, recency_cutoff(2, now=now)) == [fresh, undated]
+    assert filter_recent(entries, recency_cutoff(4, now=now)) == entries
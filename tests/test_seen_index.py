@@ -0,0 +1,36 @@
+import time
+from tools.seen_index import BloomFilter, SeenIndex
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"https://example.com/{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"https://other.com/{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+def test_seen_index_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "seen.sqlite3")
+    entry = {"id": "guid-1", "link": "https://example.com/a"}
+
+    index = SeenIndex(db_path)
+    assert not index.is_seen(entry)
+    index.mark_seen([entry])
+    index.close()
+
+    reopened = SeenIndex(db_path)
+    assert reopened.is_seen(entry)
+    assert reopened.is_seen({"link": "https://example.com/a"})
+    assert not reopened.is_seen({"link": "https://example.com/b"})
+
+def test_seen_index_evicts_expired_keys(tmp_path):
+    db_path = str(tmp_path / "seen.sqlite3")
+    index = SeenIndex(db_path, ttl_seconds=60)
+    index._conn.execute("INSERT INTO seen (key, seen_at) VALUES (?, ?)", ("stale", time.time() - 120))
+    index._conn.commit()
+
+    assert not index.contains("stale")
+    assert index.evict_expired() == 1
@@ -0,0 +1,54 @@
+import calendar
+from tools.stream_parser import parse_stream
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><title>t</title>
+<item><title>one</title><link>https://example.com/1</link><guid>g1</guid>
+<description>&lt;p&gt;First&lt;/p&gt;</description><pubDate>Wed, 01 May 2024 12:00:00 +0000</pubDate></item>
+<item><title>two</title><link>https://example.com/2</link><content:encoded>Full</content:encoded>
+<pubDate>Wed, 01 May 2024 10:00:00 +0200</pubDate></item>
+<item><title>old-1</title><pubDate>Mon, 01 Jan 2024 00:00:00 +0000</pubDate></item>
+<item><title>old-2</title><pubDate>Mon, 01 Jan 2024 00:00:00 +0000</pubDate></item>
+<item><title>old-3</title><pubDate>Mon, 01 Jan 2024 00:00:00 +0000</pubDate></item>
+<item><title>never read</title>
+"""
+
+ATOM = b"""<feed xmlns="http://www.w3.org/2005/Atom"><title>a</title>
+<entry><title>atom</title><id>urn:1</id><link rel="alternate" href="https://example.com/a"/>
+<link rel="self" href="https://example.com/self"/><summary type="html">S</summary>
+<updated>2024-05-01T12:00:00Z</updated></entry></feed>"""
+
+
+def chunked(data, size=16):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+def test_rss_entries_are_mapped_like_feedparser():
+    feed = parse_stream(chunked(RSS), max_entries=2)
+
+    assert not feed.bozo
+    first, second = feed.entries
+    assert (first.title, first.link, first.id, first.summary) == ("one", "https://example.com/1", "g1", "<p>First</p>")
+    assert calendar.timegm(first.published_parsed) == calendar.timegm((2024, 5, 1, 12, 0, 0))
+    assert calendar.timegm(second.published_parsed) == calendar.timegm((2024, 5, 1, 8, 0, 0))
+    assert second.content[0].value == "Full"
+
+def test_stops_at_recency_cutoff_without_reading_further():
+    cutoff = calendar.timegm((2024, 4, 1, 0, 0, 0))
+    # The document is truncated after the old entries, so reaching it would be a parse error
+    feed = parse_stream(chunked(RSS), max_entries=10, cutoff=cutoff)
+
+    assert not feed.bozo
+    assert [entry.title for entry in feed.entries] == ["one", "two"]
+
+def test_atom_entries():
+    feed = parse_stream([ATOM], max_entries=5)
+
+    assert feed.entries[0].link == "https://example.com/a"
+    assert feed.entries[0].id == "urn:1"
+    assert feed.entries[0].updated_parsed.tm_hour == 12
+
+def test_malformed_document_sets_bozo():
+    feed = parse_stream([b"<rss><channel><item><title>x</title></item><oops></rss>"], max_entries=5)
+
+    assert feed.bozo
+    assert [entry.title for entry in feed.entries] == ["x"]
@@ -0,0 +1,33 @@
+import time
+from tools.tag_cache import TagCache, tag_slug
+
+SITE = "https://example.com/wp-json/wp/v2/tags"
+
+
+def test_tag_slug_matches_wordpress_slugs():
+    assert tag_slug("Machine Learning") == "machine-learning"
+    assert tag_slug("  AI / ML ") == "ai-ml"
+    assert tag_slug("Café") == "cafe"
+    assert tag_slug("web_dev") == "web_dev"
+
+def test_tag_cache_persists_by_slug_across_instances(tmp_path):
+    db_path = str(tmp_path / "tags.sqlite3")
+    cache = TagCache(db_path)
+    cache.set(SITE, "Machine Learning", 12)
+    cache.close()
+
+    reopened = TagCache(db_path)
+    assert reopened.get(SITE, "machine learning") == 12
+    assert reopened.get("https://other.example.com/wp-json/wp/v2/tags", "Machine Learning") is None
+
+def test_tag_cache_expires_and_invalidates(tmp_path):
+    cache = TagCache(str(tmp_path / "tags.sqlite3"), ttl_seconds=60)
+    cache._conn.execute("INSERT INTO tags (site, slug, tag_id, cached_at) VALUES (?, ?, ?, ?)", (SITE, "old", 1, time.time() - 120))
+    cache.set_many(SITE, {"ai": 2, "cloud": 3})
+    cache.mark_warm(SITE)
+
+    assert cache.get(SITE, "old") is None
+    assert cache.invalidate(SITE, [3]) == 1
+    assert cache.get(SITE, "cloud") is None
+    assert cache.get(SITE, "ai") == 2
+    assert not cache.is_warm(SITE)
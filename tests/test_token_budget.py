@@ -0,0 +1,20 @@
+import pytest
+from tools.token_budget import TokenBudget, estimate_tokens
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hello world") == 4
+    # Punctuation-heavy text is counted per piece
+    assert estimate_tokens("a.b.c.d") == 7
+
+def test_token_budget_only_spends_what_fits():
+    budget = TokenBudget(10)
+
+    assert budget.try_spend(6)
+    assert not budget.try_spend(5)
+    assert budget.try_spend(4)
+    assert budget.remaining == 0
+
+    with pytest.raises(ValueError):
+        TokenBudget(0)
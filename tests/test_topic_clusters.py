@@ -0,0 +1,53 @@
+import json
+import numpy as np
+from tools.news_entry import NewsEntry
+from tools.topic_clusters import agglomerative_clusters, group_by_topic, render_groups_json, render_groups_text, tfidf_vectors
+
+STORIES = [
+    ("OpenAI releases GPT-5 model", "The new AI model improves reasoning"),
+    ("Apple unveils M5 MacBook Pro", "New laptops with faster chips"),
+    ("Google answers GPT-5 with Gemini update", "Google's AI model gets reasoning upgrade"),
+    ("Ransomware hits hospital network", "Attackers encrypted patient systems"),
+    ("Hospital ransomware attack spreads", "Ransomware gang claims more hospital victims"),
+]
+
+
+def make_entries():
+    return [NewsEntry(title=title, link=f"https://example.com/{i}", summary=summary) for i, (title, summary) in enumerate(STORIES)]
+
+def test_tfidf_rows_are_normalized():
+    vectors, vocabulary = tfidf_vectors([["ai", "model"], ["ai"], []])
+
+    assert vocabulary == ["ai", "model"]
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0)
+    assert not vectors[2].any()
+    assert vectors[0, 1] > vectors[0, 0]  # Rarer term weighs more
+
+def test_agglomerative_clusters_respect_threshold():
+    vectors = np.array([[1.0, 0.0], [0.0, 1.0], [0.96, 0.28], [0.6, 0.8]])
+
+    assert agglomerative_clusters(vectors, 0.9) == [[0, 2], [1], [3]]
+    # Average linkage: {0, 2} and {1, 3} are only 0.42 similar on average
+    assert agglomerative_clusters(vectors, 0.5) == [[0, 2], [1, 3]]
+    assert agglomerative_clusters(vectors, 0.4) == [[0, 1, 2, 3]]
+
+def test_group_by_topic_keeps_ranked_order():
+    groups = group_by_topic(make_entries(), threshold=0.2)
+
+    assert [[entry.title for entry in group.entries] for group in groups] == [
+        ["OpenAI releases GPT-5 model", "Google answers GPT-5 with Gemini update"],
+        ["Apple unveils M5 MacBook Pro"],
+        ["Ransomware hits hospital network", "Hospital ransomware attack spreads"],
+    ]
+    assert "ransomware" in groups[2].label and "hospital" in groups[2].label
+    assert groups[2].headline in ("Ransomware hits hospital network", "Hospital ransomware attack spreads")
+
+def test_groups_render_as_text_and_json():
+    groups = group_by_topic(make_entries(), threshold=0.2)
+
+    text = render_groups_text(groups)
+    data = json.loads(render_groups_json(groups))
+
+    assert text.count("Theme: ") == 3
+    assert "(2 stories)\nKey headline: " in text
+    assert [len(group["items"]) for group in data] == [2, 1, 2]
@@ -0,0 +1,198 @@
+import hashlib
+import hmac
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import feedparser
+import pytest
+from tools.news_fetcher_tool import RSSNewsFetcherTool
+from tools.websub import WebSubSubscriber, discover_hub
+
+
+class StandInHub:
+    """Minimal local WebSub hub: verifies subscribers asynchronously and publishes on demand"""
+
+    def __init__(self, lease_seconds=600):
+        self.subscribers = {}  # topic -> (callback, secret)
+        self.lease_seconds = lease_seconds
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                form = urllib.parse.parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+                request = {key: values[0] for key, values in form.items()}
+                self.send_response(202)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                threading.Thread(target=hub._verify, args=(request,)).start()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hub"
+
+    def _verify(self, request):
+        query = urllib.parse.urlencode({
+            "hub.mode": request["hub.mode"], "hub.topic": request["hub.topic"],
+            "hub.challenge": "challenge-123", "hub.lease_seconds": self.lease_seconds,
+        })
+        with urllib.request.urlopen(f"{request['hub.callback']}?{query}") as response:
+            if response.read() == b"challenge-123":
+                self.subscribers[request["hub.topic"]] = (request["hub.callback"], request.get("hub.secret"))
+
+    def publish(self, topic, body, secret=None):
+        callback, subscriber_secret = self.subscribers[topic]
+        key = secret or subscriber_secret
+        headers = {"Content-Type": "application/rss+xml"}
+        if key:
+            headers["X-Hub-Signature"] = "sha256=" + hmac.new(key.encode(), body, hashlib.sha256).hexdigest()
+        with urllib.request.urlopen(urllib.request.Request(callback, data=body, headers=headers)) as response:
+            return response.status
+
+    def close(self):
+        self.server.shutdown()
+
+
+def rss(titles, hub=None, self_url=None):
+    pub_date = format_datetime(datetime.now(timezone.utc))
+    links = ""
+    if hub:
+        links = f'<atom:link rel="hub" href="{hub}"/><atom:link rel="self" href="{self_url}"/>'
+    items = "".join(f"<item><title>{t}</title><link>https://example.com/{t}</link><pubDate>{pub_date}</pubDate></item>" for t in titles)
+    return (f'<?xml version="1.0"?><rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            f"<title>t</title>{links}{items}</channel></rss>").encode()
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.01)
+
+@pytest.fixture
+def hub():
+    hub = StandInHub()
+    yield hub
+    hub.close()
+
+
+def test_discover_hub_from_feed_links():
+    feed = feedparser.parse(rss(["a"], hub="https://hub.example.com/", self_url="https://example.com/feed"))
+
+    assert discover_hub(feed) == ("https://hub.example.com/", "https://example.com/feed")
+    assert discover_hub(feedparser.parse(rss(["a"]))) is None
+
+def test_verified_subscription_queues_signed_pushes(hub):
+    subscriber = WebSubSubscriber(secret="s3cret")
+    try:
+        subscriber.subscribe("https://example.com/feed", hub.url)
+        wait_for(lambda: subscriber.is_active("https://example.com/feed"))
+
+        assert hub.publish("https://example.com/feed", b"<rss>one</rss>") == 202
+        assert hub.publish("https://example.com/feed", b"<rss>forged</rss>", secret="wrong") == 202
+
+        pushes = subscriber.drain("https://example.com/feed")
+        assert [body for body, _ in pushes] == [b"<rss>one</rss>"]
+        assert subscriber.drain("https://example.com/feed") == []
+        assert not subscriber.needs_subscription("https://example.com/feed")
+    finally:
+        subscriber.stop()
+
+def test_lapsing_lease_falls_back_to_polling(hub):
+    subscriber = WebSubSubscriber()
+    try:
+        subscriber.subscribe("https://example.com/feed", hub.url)
+        wait_for(lambda: subscriber.is_active("https://example.com/feed"))
+        renew_at = subscriber.subscriptions["https://example.com/feed"].renew_at
+
+        assert renew_at < time.time() + hub.lease_seconds
+        assert not subscriber.is_active("https://example.com/feed", now=renew_at)
+        assert subscriber.needs_subscription("https://example.com/feed", now=renew_at)
+    finally:
+        subscriber.stop()
+
+def forge_verification(subscriber, token, topic, lease_seconds=864000):
+    query = urllib.parse.urlencode({"hub.mode": "subscribe", "hub.topic": topic, "hub.challenge": "x", "hub.lease_seconds": lease_seconds})
+    try:
+        with urllib.request.urlopen(f"{subscriber.callback_url}/{token}?{query}") as response:
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+def test_forged_verification_is_refused(hub):
+    feed_url = "https://example.com/feed"
+    subscriber = WebSubSubscriber(secret="s3cret", lease_seconds=600)
+    try:
+        with pytest.raises(Exception):
+            subscriber.subscribe(feed_url, "http://127.0.0.1:9/hub")  # Nothing listens there
+        token = subscriber.subscriptions[feed_url].token
+
+        assert forge_verification(subscriber, hashlib.sha1(feed_url.encode()).hexdigest(), feed_url) == 404
+        assert forge_verification(subscriber, token, feed_url) == 404
+        assert not subscriber.is_active(feed_url)
+
+        subscriber.subscribe(feed_url, hub.url)
+        wait_for(lambda: subscriber.is_active(feed_url))
+        renew_at = subscriber.subscriptions[feed_url].renew_at
+
+        # A verified request can't be verified again to stretch its lease
+        assert forge_verification(subscriber, subscriber.subscriptions[feed_url].token, feed_url) == 404
+        assert subscriber.subscriptions[feed_url].renew_at == renew_at
+    finally:
+        subscriber.stop()
+
+def test_granted_lease_is_capped(hub):
+    hub.lease_seconds = 864000
+    subscriber = WebSubSubscriber(lease_seconds=600)
+    try:
+        subscriber.subscribe("https://example.com/feed", hub.url)
+        wait_for(lambda: subscriber.is_active("https://example.com/feed"))
+
+        assert subscriber.subscriptions["https://example.com/feed"].renew_at <= time.time() + 600
+    finally:
+        subscriber.stop()
+
+def test_fetcher_switches_from_polling_to_push(hub):
+    polls = []
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            polls.append(self.path)
+            body = rss(["polled-story"], hub=hub.url, self_url=feed_url)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    feed_server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    threading.Thread(target=feed_server.serve_forever, daemon=True).start()
+    feed_url = f"http://127.0.0.1:{feed_server.server_address[1]}/rss"
+    tool = RSSNewsFetcherTool(
+        feeds=[feed_url], websub_port=0, topic_query=None, cache_dir=None,
+        seen_db_path=None, schedule_state_path=None, health_state_path=None,
+    )
+    try:
+        first = [entry.title for entry in tool.fetch_entries()]
+        wait_for(lambda: tool._get_websub().is_active(feed_url))
+        hub.publish(feed_url, rss(["pushed-story"]))
+        second = [entry.title for entry in tool.fetch_entries()]
+        third = tool.fetch_entries()
+
+        assert first == ["polled-story"]
+        assert second == ["pushed-story"]
+        assert third == []  # Nothing pushed since, and the feed isn't polled while subscribed
+        assert len(polls) == 1
+    finally:
+        tool._get_websub().stop()
+        feed_server.shutdown()
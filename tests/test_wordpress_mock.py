@@ -5,7 +5,7 @@ from tools.wordpress_poster_tool import WordPressPosterTool
 
 class TestWordPressPosterTool(unittest.TestCase):
     def setUp(self):
-        self.tool = WordPressPosterTool()
+        self.tool = WordPressPosterTool(tag_cache_path=None)
         self.test_post = """Test Blog Title
 This is the content of the test blog post.
 It includes multiple lines of text
@@ -20,7 +20,7 @@ for testing purposes."""
             "status": "publish"
         }
 
-    @patch('tools.wordpress_poster_tool.requests.post')
+    @patch('tools.wordpress_poster_tool.requests.Session.request')
     def test_successful_post(self, mock_post):
         mock_post.return_value = self.mock_response
         
@@ -39,7 +39,7 @@ for testing purposes."""
         self.assertEqual(result["id"], 123)
         self.assertEqual(result["link"], "https://example.com/test-post")
 
-    @patch('tools.wordpress_poster_tool.requests.post')
+    @patch('tools.wordpress_poster_tool.requests.Session.request')
     def test_failed_authentication(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 401
@@ -1,5 +1,10 @@
+import json
 import os
+import threading
+from dataclasses import FrozenInstanceError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
+import tools.wordpress_poster_tool as wordpress_module
 import responses
 from dotenv import load_dotenv
 from tools.wordpress_poster_tool import WordPressPosterTool
@@ -12,13 +17,15 @@ load_dotenv()  # Load environment variables at module level
 def wordpress_tool():
     return WordPressPosterTool(
         name="wordpress_poster",
-        description="Posts content to a WordPress blog using the REST API"
+        description="Posts content to a WordPress blog using the REST API",
+        tag_cache_path=None
     )
 
 def test_build_api_url():
     tool = WordPressPosterTool(
         name="wordpress_poster",
-        description="Posts content to a WordPress blog using the REST API"
+        description="Posts content to a WordPress blog using the REST API",
+        tag_cache_path=None
     )
     # Test with clean URL
     assert tool._build_api_url('https://example.com') == 'https://example.com/wp-json/wp/v2/posts'
@@ -137,7 +144,8 @@ def test_missing_env_vars():
     try:
         tool = WordPressPosterTool(
             name="wordpress_poster",
-            description="Posts content to a WordPress blog using the REST API"
+            description="Posts content to a WordPress blog using the REST API",
+            tag_cache_path=None
         )
         with pytest.raises(ValueError) as exc_info:
             tool._run("Test", "Content", [], [])
@@ -150,3 +158,93 @@ def test_missing_env_vars():
             os.environ['WORDPRESS_USER'] = original_user
         if original_pass:
             os.environ['WORDPRESS_PASS'] = original_pass
+
+def test_posts_reuse_keep_alive_connections(monkeypatch):
+    connections = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, data):
+            body = json.dumps(data).encode()
+            self.send_response(200 if self.command == "GET" else 201)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            connections.add(self.client_address)
+            self._reply([{"id": 7, "slug": "ai"}])
+
+        def do_POST(self):
+            connections.add(self.client_address)
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self._reply({"id": 123, "link": "http://127.0.0.1/test-post"})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("WORDPRESS_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("WORDPRESS_USER", "user")
+    monkeypatch.setenv("WORDPRESS_PASS", "pass")
+    tool = WordPressPosterTool(pool_maxsize=1, tag_cache_path=None)
+    try:
+        for title in ("First", "Second"):
+            assert tool._run(title, "content", ["ai"], [])["id"] == 123
+    finally:
+        server.shutdown()
+
+    assert len(connections) == 1  # Four requests over a single kept-alive connection
+
+def test_config_is_resolved_once(monkeypatch):
+    loads = []
+    monkeypatch.setattr(wordpress_module, "load_dotenv", lambda *args, **kwargs: loads.append(args))
+    monkeypatch.setenv("WORDPRESS_URL", "example.com/")
+    monkeypatch.setenv("WORDPRESS_USER", "user")
+    monkeypatch.setenv("WORDPRESS_PASS", "pass")
+    tool = WordPressPosterTool(tag_cache_path=None)
+
+    configs = [tool._get_config() for _ in range(5)]
+    credentials = [tool._get_credentials() for _ in range(5)]
+
+    assert all(config is configs[0] for config in configs)
+    assert credentials[-1] == ("https://example.com/wp-json/wp/v2/posts", "user", "pass")
+    assert len(loads) <= 1
+    assert configs[0].tags_url == "https://example.com/wp-json/wp/v2/tags"
+    assert configs[0].media_url == "https://example.com/wp-json/wp/v2/media"
+    assert "pass" not in repr(configs[0])
+    with pytest.raises(FrozenInstanceError):
+        configs[0].user = "other"
+
+def test_config_reloads_when_env_file_changes(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text("WORDPRESS_URL=https://example.com\nWORDPRESS_USER=alice\nWORDPRESS_PASS=one\n")
+    monkeypatch.setattr(wordpress_module, "find_dotenv", lambda: str(env_file))
+    for name in ("WORDPRESS_URL", "WORDPRESS_USER", "WORDPRESS_PASS"):
+        monkeypatch.delenv(name, raising=False)
+    tool = WordPressPosterTool(tag_cache_path=None)
+
+    assert tool._get_config().user == "alice"
+    env_file.write_text("WORDPRESS_URL=https://blog.example.com\nWORDPRESS_USER=bob\nWORDPRESS_PASS=two\n")
+    os.utime(env_file, (0, 0))
+
+    config = tool._get_config()
+    assert (config.user, config.posts_url) == ("bob", "https://blog.example.com/wp-json/wp/v2/posts")
+    assert tool._get_config() is config
+
+@responses.activate
+def test_throttled_post_is_retried_after_retry_after(monkeypatch):
+    monkeypatch.setenv("WORDPRESS_URL", "https://throttled.example.com")
+    monkeypatch.setenv("WORDPRESS_USER", "user")
+    monkeypatch.setenv("WORDPRESS_PASS", "pass")
+    api_url = "https://throttled.example.com/wp-json/wp/v2/posts"
+    responses.add(responses.POST, api_url, json={"code": "rate_limited"}, status=429, headers={"Retry-After": "0"})
+    responses.add(responses.POST, api_url, json={"id": 123, "link": "https://throttled.example.com/test-post"}, status=201)
+    tool = WordPressPosterTool(requests_per_second=50.0, request_burst=1, tag_cache_path=None)
+
+    assert tool._run("Title", "content", [], [])["id"] == 123
+    assert len(responses.calls) == 2
+    assert tool._get_rate_limiter().bucket(api_url).rate < 50.0
@@ -8,9 +8,12 @@ from logger import setup_logger
 logger = setup_logger()
 load_dotenv()
 
+def slug_lookup(slugs):
+    return responses.matchers.query_param_matcher({"slug": slugs, "per_page": "100", "_fields": "id,slug"})
+
 @pytest.fixture
 def wordpress_tool():
-    return WordPressPosterTool()
+    return WordPressPosterTool(tag_cache_path=None)
 
 @responses.activate
 def test_get_or_create_tag(wordpress_tool):
@@ -20,20 +23,22 @@ def test_get_or_create_tag(wordpress_tool):
 
     # Mock environment variables
     with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
-        # Mock the GET request to search for existing tag
+        # Mock the GET request to look up an existing tag by slug
         rsps.add(
             responses.GET,
-            f"{tags_url}?search=technology",
-            json=[{"id": 1, "name": "technology"}],
-            status=200
+            tags_url,
+            json=[{"id": 1, "slug": "technology"}],
+            status=200,
+            match=[slug_lookup("technology")]
         )
 
         # Mock the GET request for a non-existent tag
         rsps.add(
             responses.GET,
-            f"{tags_url}?search=newtag",
+            tags_url,
             json=[],
-            status=200
+            status=200,
+            match=[slug_lookup("newtag")]
         )
 
         # Mock the POST request to create a new tag
@@ -76,18 +81,13 @@ def test_post_with_tags(wordpress_tool):
     }
 
     with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
-        # Mock tag search responses
-        rsps.add(
-            responses.GET,
-            f"{tags_url}?search=technology",
-            json=[{"id": 1, "name": "technology"}],
-            status=200
-        )
+        # Mock a single lookup of both tags by slug
         rsps.add(
             responses.GET,
-            f"{tags_url}?search=ai",
-            json=[{"id": 2, "name": "ai"}],
-            status=200
+            tags_url,
+            json=[{"id": 2, "slug": "ai"}, {"id": 1, "slug": "technology"}],
+            status=200,
+            match=[slug_lookup("technology,ai")]
         )
 
         # Mock successful post creation
@@ -127,3 +127,75 @@ def test_post_with_tags(wordpress_tool):
             # Verify response
             assert result["id"] == 123
             assert result["tags"] == [1, 2]
+
+@pytest.fixture
+def wordpress_env(monkeypatch):
+    monkeypatch.setenv("WORDPRESS_URL", "https://example.com/wp-json/wp/v2/posts")
+    monkeypatch.setenv("WORDPRESS_USER", "testuser")
+    monkeypatch.setenv("WORDPRESS_PASS", "testpass")
+
+def test_cached_tags_resolve_without_requests(tmp_path, wordpress_env):
+    tags_url = "https://example.com/wp-json/wp/v2/tags"
+    tool = WordPressPosterTool(tag_cache_path=str(tmp_path / "tags.sqlite3"))
+
+    with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
+        rsps.add(responses.GET, tags_url, json=[{"id": 1, "slug": "technology"}], match=[slug_lookup("technology")])
+        rsps.add(responses.POST, "https://example.com/wp-json/wp/v2/posts", json={"id": 10, "tags": [1]}, status=201)
+        tool._run("First", "content", ["technology"], [])
+
+    with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
+        rsps.add(responses.POST, "https://example.com/wp-json/wp/v2/posts", json={"id": 11, "tags": [1]}, status=201,
+                 match=[responses.matchers.json_params_matcher({"tags": [1]}, strict_match=False)])
+        reopened = WordPressPosterTool(tag_cache_path=str(tmp_path / "tags.sqlite3"))
+        assert reopened._run("Second", "content", ["Technology"], [])["id"] == 11
+
+def test_warm_cache_pages_through_tags_once(tmp_path, wordpress_env):
+    tags_url = "https://example.com/wp-json/wp/v2/tags"
+    tool = WordPressPosterTool(tag_cache_path=str(tmp_path / "tags.sqlite3"), tag_cache_warmup=True)
+
+    with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
+        rsps.add(responses.GET, f"{tags_url}?per_page=100&page=1&_fields=id%2Cslug", json=[{"id": 1, "slug": "ai"}],
+                 headers={"X-WP-TotalPages": "2"})
+        rsps.add(responses.GET, f"{tags_url}?per_page=100&page=2&_fields=id%2Cslug", json=[{"id": 2, "slug": "%e6%97%a5%e6%9c%ac"}],
+                 headers={"X-WP-TotalPages": "2"})
+        # Missing from a warm cache means new: created without a lookup first
+        rsps.add(responses.POST, tags_url, json={"id": 3, "name": "robots"}, status=201)
+        rsps.add(responses.POST, "https://example.com/wp-json/wp/v2/posts", json={"id": 10, "tags": [1, 2, 3]}, status=201,
+                 match=[responses.matchers.json_params_matcher({"tags": [1, 2, 3]}, strict_match=False)])
+        tool._run("Post", "content", ["AI", "日本", "robots"], [])
+
+    assert tool._get_tag_cache().is_warm(tags_url)
+
+def test_rejected_cached_tag_is_looked_up_again(tmp_path, wordpress_env):
+    tags_url = "https://example.com/wp-json/wp/v2/tags"
+    posts_url = "https://example.com/wp-json/wp/v2/posts"
+    tool = WordPressPosterTool(tag_cache_path=str(tmp_path / "tags.sqlite3"))
+    tool._get_tag_cache().set(tags_url, "ai", 99)  # Tag deleted on the site since
+
+    with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
+        rsps.add(responses.POST, posts_url, json={"code": "rest_invalid_param"}, status=400,
+                 match=[responses.matchers.json_params_matcher({"tags": [99]}, strict_match=False)])
+        rsps.add(responses.GET, tags_url, json=[{"id": 5, "slug": "ai"}], match=[slug_lookup("ai")])
+        rsps.add(responses.POST, posts_url, json={"id": 10, "tags": [5]}, status=201,
+                 match=[responses.matchers.json_params_matcher({"tags": [5]}, strict_match=False)])
+        assert tool._run("Post", "content", ["ai"], [])["id"] == 10
+
+    assert tool._get_tag_cache().get(tags_url, "ai") == 5
+
+def test_tags_resolved_by_exact_slug_and_missing_ones_created(wordpress_tool, wordpress_env):
+    tags_url = "https://example.com/wp-json/wp/v2/tags"
+    auth = HTTPBasicAuth("testuser", "testpass")
+
+    with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
+        # A fuzzy search for "ai" would also match "ai-safety"; the slug filter is exact
+        rsps.add(responses.GET, tags_url, json=[{"id": 4, "slug": "ai"}, {"id": 9, "slug": "ai-safety"}],
+                 match=[slug_lookup("ai,machine-learning,robots")])
+        rsps.add(responses.POST, tags_url, json={"id": 21, "name": "Machine Learning"}, status=201,
+                 match=[responses.matchers.json_params_matcher({"name": "Machine Learning", "slug": "machine-learning"})])
+        rsps.add(responses.POST, tags_url, json={"code": "term_exists", "data": {"status": 400, "term_id": 22}}, status=400,
+                 match=[responses.matchers.json_params_matcher({"name": "Robots", "slug": "robots"})])
+
+        tag_ids, cached_ids = wordpress_tool._resolve_tags(["AI", "Machine Learning", "ai", "Robots", "!!"], auth)
+
+    assert tag_ids == [4, 21, 22]
+    assert cached_ids == []
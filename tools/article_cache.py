@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+from logger import setup_logger
+from tools.atomic_file import write_json_atomic
+
+logger = setup_logger()
+
+
+class ArticleCache:
+    """Content-addressed on-disk cache of extracted article text
+
+    Each article is stored in a JSON file named after the SHA-256 of its URL,
+    fanned out into subdirectories by the first two hex digits. Pages without
+    extractable text are cached as empty strings so they aren't refetched.
+    With a `max_age` in seconds, older entries are never returned and their
+    files are removed when the cache is opened.
+    """
+
+    def __init__(self, cache_dir: str, max_age: Optional[float] = None):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        os.makedirs(cache_dir, exist_ok=True)
+
+        if max_age is not None:
+            evicted = self.evict_expired()
+            if evicted:
+                logger.info(f"Evicted {evicted} expired entries from article cache")
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """Delete files older than `max_age` and return how many were removed"""
+        if self.max_age is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.max_age
+        removed = 0
+        for directory, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    # Entries are written once, so the modification time is when they were fetched
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def get(self, url: str, now: Optional[float] = None) -> Optional[str]:
+        """Return the cached text for `url`, or None if missing, stale or unreadable"""
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable article cache for {url}: {str(e)}")
+            return None
+
+        if data.get("url") != url:
+            return None
+        if self.max_age is not None:
+            now = time.time() if now is None else now
+            if now - data.get("fetched_at", 0.0) > self.max_age:
+                return None
+        return data.get("text", "")
+
+    def set(self, url: str, text: str) -> None:
+        """Store the extracted text for `url`"""
+        write_json_atomic(self._path(url), {"url": url, "text": text, "fetched_at": time.time()})
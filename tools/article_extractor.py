@@ -0,0 +1,272 @@
+import codecs
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from logger import setup_logger
+from tools.article_cache import ArticleCache
+from tools.html_text import html_to_text, truncate_words
+from tools.http_client import fetch, get_shared_session
+
+logger = setup_logger()
+
+# Elements that never hold article text
+_SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "iframe", "object", "svg", "template", "head",
+    "nav", "aside", "footer", "form", "button", "select", "figure",
+})
+_VOID_TAGS = frozenset({"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"})
+_PARAGRAPH_TAGS = frozenset({"p", "pre", "blockquote"})
+# Containers never treated as boilerplate, whatever their class says
+_STRUCTURAL_TAGS = frozenset({"html", "body", "main", "article"})
+_UNLIKELY_RE = re.compile(r"comment|sidebar|footer|nav|menu|share|social|related|promo|advert|sponsor|newsletter|subscribe|cookie|popup|modal|banner", re.I)
+_LIKELY_RE = re.compile(r"article|content|entry|post|story|body|main|text", re.I)
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+MIN_PARAGRAPH_CHARS = 25
+# Paragraphs that are mostly link text are navigation, not content
+MAX_LINK_DENSITY = 0.5
+# Siblings of the best container scoring at least this fraction of it are included too
+SIBLING_SCORE_RATIO = 0.2
+LIKELY_CONTAINER_BONUS = 25.0
+
+
+class _ReadabilityParser(HTMLParser):
+    """Collects paragraphs with their enclosing containers, dropping boilerplate"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parents: List[Optional[int]] = []  # Parent node of every container, by node id
+        self.bonus: List[float] = []
+        self.paragraphs: List[Tuple[Tuple[int, ...], str, int]] = []  # (ancestor ids, text, link chars)
+        self._open: List[Tuple[str, int, bool]] = []  # (tag, node id, skipped)
+        self._skipped_open = 0
+        self._link_depth = 0
+        self._paragraph: Optional[List[str]] = None
+        self._paragraph_ancestors: Tuple[int, ...] = ()
+        self._paragraph_links = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            if tag == "br" and self._paragraph is not None:
+                self._paragraph.append(" ")
+            return
+        if tag in _PARAGRAPH_TAGS:
+            self._finish_paragraph()  # An open <p> is implicitly closed by the next one
+
+        attributes = dict(attrs)
+        hints = f"{attributes.get('class') or ''} {attributes.get('id') or ''}"
+        likely = bool(_LIKELY_RE.search(hints))
+        skipped = tag in _SKIP_TAGS or (tag not in _STRUCTURAL_TAGS and not likely and bool(_UNLIKELY_RE.search(hints)))
+
+        node = len(self.parents)
+        self.parents.append(self._open[-1][1] if self._open else None)
+        self.bonus.append(LIKELY_CONTAINER_BONUS if likely or tag in ("article", "main") else 0.0)
+        self._open.append((tag, node, skipped))
+        if skipped:
+            self._skipped_open += 1
+        if tag == "a":
+            self._link_depth += 1
+        if tag in _PARAGRAPH_TAGS and not self._skipped_open:
+            self._paragraph = []
+            self._paragraph_ancestors = tuple(node for _, node, _ in self._open[:-1])
+            self._paragraph_links = 0
+
+    def handle_endtag(self, tag):
+        if not any(open_tag == tag for open_tag, _, _ in self._open):
+            return  # Stray end tag
+        while self._open:
+            open_tag, _, skipped = self._open.pop()
+            if skipped:
+                self._skipped_open -= 1
+            if open_tag == "a":
+                self._link_depth -= 1
+            if open_tag in _PARAGRAPH_TAGS:
+                self._finish_paragraph()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._paragraph is not None and not self._skipped_open:
+            self._paragraph.append(data)
+            if self._link_depth:
+                self._paragraph_links += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._finish_paragraph()
+
+    def _finish_paragraph(self):
+        if self._paragraph is None:
+            return
+        text = " ".join("".join(self._paragraph).split())
+        if text:
+            self.paragraphs.append((self._paragraph_ancestors, text, self._paragraph_links))
+        self._paragraph = None
+
+
+def extract_main_text(html: str, max_chars: Optional[int] = None) -> str:
+    """Extract the main article text of an HTML page, readability style
+
+    Paragraphs score their parent container (and half for the grandparent)
+    by length and comma count, discounted by link density; containers whose
+    class or id look like content get a bonus. The text of the best container
+    and its strong siblings is returned, with navigation, sidebars, comments
+    and scripts left out. Pages without scorable paragraphs fall back to all
+    visible text.
+    """
+    parser = _ReadabilityParser()
+    parser.feed(html)
+    parser.close()
+
+    scores: Dict[int, float] = {}
+    for ancestors, text, link_chars in parser.paragraphs:
+        if len(text) < MIN_PARAGRAPH_CHARS or not ancestors:
+            continue
+        score = (1 + text.count(",") + min(len(text) // 100, 3)) * (1 - link_chars / len(text))
+        scores[ancestors[-1]] = scores.get(ancestors[-1], 0.0) + score
+        if len(ancestors) > 1:
+            scores[ancestors[-2]] = scores.get(ancestors[-2], 0.0) + score / 2
+
+    if not scores:
+        return html_to_text(html, max_chars=max_chars)
+
+    totals = {node: score + parser.bonus[node] for node, score in scores.items()}
+    best = max(totals, key=lambda node: (totals[node], -node))
+    threshold = totals[best] * SIBLING_SCORE_RATIO
+    selected = {best} | {
+        node for node, total in totals.items()
+        if parser.parents[node] is not None and parser.parents[node] == parser.parents[best] and total >= threshold
+    }
+
+    text = " ".join(
+        paragraph for ancestors, paragraph, link_chars in parser.paragraphs
+        if selected.intersection(ancestors) and link_chars <= len(paragraph) * MAX_LINK_DENSITY
+    )
+    if max_chars:
+        text = truncate_words(text, max_chars)
+    return text
+
+
+def decode_html(content: bytes, content_type: str = "") -> str:
+    """Decode an HTML body using the charset from its Content-Type or meta tag"""
+    match = re.search(r"charset=[\"']?([\w-]+)", content_type, re.I)
+    charset = match.group(1) if match else None
+    if not charset:
+        meta = _CHARSET_RE.search(content[:4096])
+        charset = meta.group(1).decode("ascii") if meta else None
+    try:
+        codecs.lookup(charset or "utf-8")
+    except LookupError:
+        charset = None
+    return content.decode(charset or "utf-8", errors="replace")
+
+
+class HostThrottle:
+    """Per-host politeness limits shared by concurrent workers
+
+    At most `max_concurrent` requests run against one host at a time, and
+    request starts to the same host are spaced at least `min_interval`
+    seconds apart. Different hosts never wait for each other.
+    """
+
+    def __init__(self, max_concurrent: int = 1, min_interval: float = 1.0):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold a request slot for the host of `url`, waiting for politeness limits"""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_concurrent))
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class ArticleExtractor:
+    """Fetches linked article pages and extracts their main text
+
+    Pages are fetched by a bounded thread pool through the shared pooled
+    session, under per-host politeness limits. Extracted text is kept in an
+    optional ArticleCache, so an article is downloaded once however many runs
+    select it.
+    """
+
+    def __init__(self, cache: Optional[ArticleCache] = None, max_workers: int = 4, host_concurrency: int = 1, host_delay: float = 1.0,
+                 timeout: float = 10.0, max_bytes: int = 2_000_000, max_chars: Optional[int] = 4000):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.throttle = HostThrottle(max_concurrent=host_concurrency, min_interval=host_delay)
+        self.session = get_shared_session(max_connections_per_host=host_concurrency)
+
+    def extract(self, url: str) -> str:
+        """Return the main text of the article at `url`, from the cache when possible"""
+        text = self.cache.get(url) if self.cache else None
+        if text is None:
+            with self.throttle.slot(url):
+                response = fetch(self.session, url, timeout=self.timeout, max_bytes=self.max_bytes)
+            if response.status_code >= 400:
+                raise requests.HTTPError(f"HTTP {response.status_code} for {url}")
+            content_type = response.headers.get("content-type", "")
+            if content_type and "html" not in content_type:
+                logger.info(f"Not extracting {content_type} article: {url}")
+                text = ""
+            else:
+                text = extract_main_text(decode_html(response.content, content_type))
+            if self.cache:
+                self.cache.set(url, text)
+        if self.max_chars:
+            text = truncate_words(text, self.max_chars)
+        return text
+
+    def extract_many(self, urls: Iterable[str], deadline: Optional[float] = None) -> Dict[str, str]:
+        """Extract several articles concurrently, keyed by URL
+
+        Articles that fail, have no extractable text or miss the overall
+        `deadline` (seconds) are left out.
+        """
+        urls = list(dict.fromkeys(urls))
+        texts: Dict[str, str] = {}
+        if not urls:
+            return texts
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(urls))))
+        futures = {executor.submit(self.extract, url): url for url in urls}
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                url = futures[future]
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.warning(f"Could not extract article {url}: {str(e)}")
+                    continue
+                if text:
+                    texts[url] = text
+        except FuturesTimeoutError:
+            missing = [url for future, url in futures.items() if not future.done()]
+            logger.warning(f"Article extraction deadline of {deadline}s exceeded, skipping {len(missing)} articles")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"Extracted {len(texts)}/{len(urls)} articles")
+        return texts
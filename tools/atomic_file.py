@@ -0,0 +1,33 @@
+import json
+import os
+import tempfile
+from typing import Any, Union
+
+
+def write_atomic(path: str, data: Union[str, bytes]) -> None:
+    """Replace `path` with `data` so readers never see a partly written file
+
+    The data goes to a temporary file in the same directory, which is then
+    renamed over `path`. On any error the temporary file is removed and the
+    original file is left untouched.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        if isinstance(data, str):
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+        else:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path: str, obj: Any) -> None:
+    """Serialize `obj` to JSON and write it to `path` atomically"""
+    write_atomic(path, json.dumps(obj))
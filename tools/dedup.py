@@ -0,0 +1,137 @@
+import hashlib
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from tools.text import tokenize
+
+_MAX_HASH = (1 << 32) - 1
+# Shingle sets hashed per vectorized step, bounding the (num_perm x shingles) work array
+SIGNATURE_CHUNK = 512
+
+
+def shingles(text: str, size: int = 1) -> Set[str]:
+    """Return the set of word shingles of a text, ignoring case and stopwords
+
+    Shingles don't span lines, so fields joined by newlines (a title and its
+    summary) are shingled separately.
+    """
+    result: Set[str] = set()
+    for line in text.splitlines():
+        words = tokenize(line)
+        if len(words) < size:
+            if words:
+                result.add(" ".join(words))
+            continue
+        result.update(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return result
+
+
+def _hash_shingle(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class NearDuplicateDetector:
+    """MinHash + LSH detector for near-duplicate texts
+
+    Signatures are split into `bands` bands of `num_perm // bands` rows; only
+    texts sharing a band bucket are compared, so the cost grows with the
+    number of texts rather than the number of pairs. Candidates are confirmed
+    when the exact Jaccard similarity of their shingle sets reaches
+    `threshold`, so estimation noise can't merge stories near the threshold.
+    Word bigrams keep stories on the same topic apart ("patches Windows
+    zero-day" vs "patches Exchange zero-day") where single words overlap.
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 64, bands: int = 16, shingle_size: int = 2, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError("Threshold must be between 0 and 1")
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Multiply-shift hashing: the top 32 bits of (a * h + b) mod 2**64, with odd a
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+        self._band_mix = rng.integers(0, 1 << 63, size=self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a text"""
+        return tuple(self._signatures([shingles(text, self.shingle_size)])[0].tolist())
+
+    def _signatures(self, shingle_sets: Sequence[Set[str]]) -> np.ndarray:
+        """MinHash signatures of many shingle sets at once, one row per set
+
+        Shingles are hashed into one array per chunk of sets and every
+        permutation is applied to it in a single vectorized step. Empty sets
+        get all-max rows.
+        """
+        signatures = np.full((len(shingle_sets), self.num_perm), _MAX_HASH, dtype=np.uint64)
+        for offset in range(0, len(shingle_sets), SIGNATURE_CHUNK):
+            chunk = shingle_sets[offset:offset + SIGNATURE_CHUNK]
+            sizes = np.array([len(shingle_set) for shingle_set in chunk], dtype=np.int64)
+            filled = np.flatnonzero(sizes)
+            if not len(filled):
+                continue
+            hashes = np.fromiter((_hash_shingle(s) for shingle_set in chunk for s in shingle_set), dtype=np.uint64, count=int(sizes.sum()))
+            with np.errstate(over="ignore"):
+                permuted = (self._a * hashes + self._b) >> np.uint64(32)
+            starts = (np.cumsum(sizes) - sizes)[filled]
+            signatures[offset + filled] = np.minimum.reduceat(permuted, starts, axis=1).T
+        return signatures
+
+    @staticmethod
+    def similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+        """Estimate the Jaccard similarity of two signatures"""
+        return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+    @staticmethod
+    def jaccard(a: Set[str], b: Set[str]) -> float:
+        """Exact Jaccard similarity of two shingle sets"""
+        return len(a & b) / len(a | b) if a or b else 0.0
+
+    def cluster(self, texts: Sequence[str]) -> List[List[int]]:
+        """Group texts into clusters of near-duplicates
+
+        Returns lists of indices into `texts`, each sorted ascending and
+        ordered by their first index, so the input order is preserved.
+        """
+        text_shingles = [shingles(text, self.shingle_size) for text in texts]
+        # Each band's rows folded into one 64-bit bucket key; collisions only cost an exact comparison
+        with np.errstate(over="ignore"):
+            band_keys = (self._signatures(text_shingles).reshape(len(texts), self.bands, self.rows) * self._band_mix).sum(axis=2).tolist()
+        parent = list(range(len(texts)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for index, keys in enumerate(band_keys):
+            if not text_shingles[index]:
+                continue  # Empty text, never a duplicate
+            for key in enumerate(keys):
+                candidates = buckets.setdefault(key, [])
+                represented = False
+                for other in candidates:
+                    root_a, root_b = find(index), find(other)
+                    if root_a == root_b:
+                        represented = True
+                    elif self.jaccard(text_shingles[index], text_shingles[other]) >= self.threshold:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+                        represented = True
+                # One member per cluster and bucket is enough to find it again;
+                # keeping all of them makes large duplicate groups quadratic
+                if not represented:
+                    candidates.append(index)
+
+        clusters: Dict[int, List[int]] = {}
+        for index in range(len(texts)):
+            clusters.setdefault(find(index), []).append(index)
+        return sorted(clusters.values(), key=lambda members: members[0])
@@ -0,0 +1,112 @@
+import math
+import re
+from typing import Callable, Dict, List, Tuple
+
+from tools.text import tokenize
+
+# Sentence-ending punctuation, optional closing quotes/brackets, then whitespace
+_BOUNDARY_RE = re.compile(r"[.!?][\"'”’)\]]*\s+")
+_INITIALISM_RE = re.compile(r"^(?:[a-z]\.)*[a-z]$")
+_ABBREVIATIONS = frozenset("""
+mr mrs ms dr prof sr jr st inc corp co ltd vs etc e.g i.e no approx est dept gov sen rep gen
+jan feb mar apr jun jul aug sep sept oct nov dec
+""".split())
+
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITERATIONS = 50
+TEXTRANK_TOLERANCE = 1e-6
+# Prior towards the lead: the score of the i-th sentence is scaled by 1 + LEAD_BIAS / (i + 1)
+LEAD_BIAS = 1.0
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split prose into sentences, keeping abbreviations like "U.S." or "Inc." intact"""
+    sentences = []
+    start = 0
+    for match in _BOUNDARY_RE.finditer(text):
+        following = text[match.end():match.end() + 1]
+        if following and not (following.isupper() or following.isdigit() or following in "\"'“‘(["):
+            continue
+        word = text[start:match.start() + 1].rsplit(None, 1)[-1].lower().rstrip(".")
+        if match.group()[0] == "." and (word in _ABBREVIATIONS or _INITIALISM_RE.match(word)):
+            continue
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    if text[start:].strip():
+        sentences.append(text[start:].strip())
+    return sentences
+
+
+def textrank_scores(sentences: List[List[str]]) -> List[float]:
+    """Rank tokenized sentences by TextRank centrality
+
+    Sentences are linked by word overlap normalized by their log lengths
+    (Mihalcea & Tarau, 2004); the score is the weighted PageRank of that graph.
+    """
+    count = len(sentences)
+    words = [set(tokens) for tokens in sentences]
+    neighbours: List[List[Tuple[int, float]]] = [[] for _ in range(count)]
+    out_weight = [0.0] * count
+    for i in range(count):
+        for j in range(i + 1, count):
+            overlap = len(words[i] & words[j])
+            if not overlap:
+                continue
+            norm = math.log(len(words[i]) + 1) + math.log(len(words[j]) + 1)
+            weight = overlap / norm
+            neighbours[i].append((j, weight))
+            neighbours[j].append((i, weight))
+            out_weight[i] += weight
+            out_weight[j] += weight
+
+    scores = [1.0] * count
+    for _ in range(TEXTRANK_MAX_ITERATIONS):
+        updated = [
+            (1 - TEXTRANK_DAMPING) + TEXTRANK_DAMPING * sum(weight / out_weight[j] * scores[j] for j, weight in neighbours[i])
+            for i in range(count)
+        ]
+        converged = max(abs(a - b) for a, b in zip(scores, updated)) < TEXTRANK_TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def summarize_lead(text: str, max_sentences: int) -> str:
+    """Cut text down to its first `max_sentences` sentences
+
+    News puts the key facts first, and on the benchmark corpus this beats
+    TextRank on recall at every K. Texts that already have at most
+    `max_sentences` sentences are returned unchanged.
+    """
+    if max_sentences < 1:
+        raise ValueError("max_sentences must be at least 1")
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences:
+        return text
+    return " ".join(sentences[:max_sentences])
+
+
+def summarize_extractive(text: str, max_sentences: int) -> str:
+    """Cut text down to its `max_sentences` most central sentences, in original order
+
+    Sentences are ranked by TextRank with a prior towards the lead, since
+    news puts the key facts first. Texts that already have at most
+    `max_sentences` sentences are returned unchanged.
+    """
+    if max_sentences < 1:
+        raise ValueError("max_sentences must be at least 1")
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences:
+        return text
+    centrality = textrank_scores([tokenize(sentence) for sentence in sentences])
+    scores = [score * (1 + LEAD_BIAS / (position + 1)) for position, score in enumerate(centrality)]
+    best = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))[:max_sentences]
+    return " ".join(sentences[i] for i in sorted(best))
+
+
+# Summarizers selectable by name, e.g. through the news fetcher's `summary_method`
+SUMMARIZERS: Dict[str, Callable[[str, int], str]] = {
+    "lead": summarize_lead,
+    "textrank": summarize_extractive,
+}
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import feedparser
+from logger import setup_logger
+from tools.atomic_file import write_json_atomic
+
+logger = setup_logger()
+
+_STRUCT_TIME_KEY = "__struct_time__"
+
+
+def _encode(value: Any) -> Any:
+    """Convert feedparser values into JSON-serializable data"""
+    if isinstance(value, time.struct_time):
+        return {_STRUCT_TIME_KEY: list(value)}
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Rebuild feedparser-style values from cached JSON data"""
+    if isinstance(value, dict):
+        if _STRUCT_TIME_KEY in value:
+            return time.struct_time(value[_STRUCT_TIME_KEY])
+        return feedparser.FeedParserDict({k: _decode(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+class CachedFeed:
+    """HTTP validators and parsed entries stored for a single feed URL"""
+
+    def __init__(self, url: str, etag: Optional[str], modified: Optional[str], entries: List[Dict[str, Any]], fetched_at: float):
+        self.url = url
+        self.etag = etag
+        self.modified = modified
+        self.entries = entries
+        self.fetched_at = fetched_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Return the headers for a conditional GET against this feed"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.modified:
+            headers['If-Modified-Since'] = self.modified
+        return headers
+
+    def to_feed(self) -> feedparser.FeedParserDict:
+        """Return the cached entries as a parsed feed, as served on a 304"""
+        return feedparser.FeedParserDict(bozo=False, status=304, entries=list(self.entries))
+
+
+class FeedCache:
+    """On-disk cache of feed validators (ETag/Last-Modified) and parsed entries
+
+    Each feed is stored in its own JSON file named after a hash of its URL,
+    written atomically so concurrent fetch workers never see partial files.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, url: str) -> Optional[CachedFeed]:
+        """Return the cached feed for `url`, or None if missing or unreadable"""
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable feed cache for {url}: {str(e)}")
+            return None
+
+        return CachedFeed(
+            url=data.get("url", url),
+            etag=data.get("etag"),
+            modified=data.get("modified"),
+            entries=_decode(data.get("entries", [])),
+            fetched_at=data.get("fetched_at", 0.0),
+        )
+
+    def set(self, url: str, etag: Optional[str], modified: Optional[str], entries: List[Dict[str, Any]]) -> None:
+        """Store validators and parsed entries for `url`"""
+        data = {
+            "url": url,
+            "etag": etag,
+            "modified": modified,
+            "entries": _encode(entries),
+            "fetched_at": time.time(),
+        }
+        write_json_atomic(self._path(url), data)
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Optional
+
+from logger import setup_logger
+from tools.atomic_file import write_json_atomic
+
+logger = setup_logger()
+
+
+@dataclass
+class FeedHealth:
+    """Fetch health of a single feed"""
+    consecutive_failures: int = 0
+    last_latency: Optional[float] = None
+    last_success: Optional[float] = None
+    last_failure: Optional[float] = None
+    last_error: Optional[str] = None
+    open_until: Optional[float] = None  # Circuit is open (feed skipped) until this time
+
+
+class FeedHealthTracker:
+    """Per-feed health records with a circuit breaker
+
+    After `failure_threshold` consecutive failures the circuit opens and the
+    feed is skipped for a cooldown that doubles with every further failure,
+    from `base_cooldown` up to `max_cooldown`. Once the cooldown expires the
+    circuit is half-open: the next fetch is a probe that closes the circuit
+    on success or reopens it with a longer cooldown on failure.
+    """
+
+    def __init__(self, state_path: Optional[str] = None, failure_threshold: int = 3, base_cooldown: float = 600.0, max_cooldown: float = 86400.0):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.state_path = state_path
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.records: Dict[str, FeedHealth] = {}
+        self._lock = threading.Lock()
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    known = {f.name for f in fields(FeedHealth)}
+                    self.records = {
+                        url: FeedHealth(**{k: v for k, v in record.items() if k in known})
+                        for url, record in json.load(f).items()
+                    }
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable feed health state {state_path}: {str(e)}")
+
+    def get(self, url: str) -> FeedHealth:
+        with self._lock:
+            return self.records.setdefault(url, FeedHealth())
+
+    def allow_request(self, url: str, now: Optional[float] = None) -> bool:
+        """Check whether a feed may be fetched (circuit closed or half-open)"""
+        record = self.records.get(url)
+        if record is None or record.open_until is None:
+            return True
+        now = time.time() if now is None else now
+        return now >= record.open_until
+
+    def record_success(self, url: str, latency: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            record = self.records.setdefault(url, FeedHealth())
+            if record.open_until is not None:
+                logger.info(f"Feed recovered, closing circuit: {url}")
+            record.consecutive_failures = 0
+            record.last_latency = latency
+            record.last_success = now
+            record.last_error = None
+            record.open_until = None
+
+    def record_failure(self, url: str, error: str, latency: Optional[float] = None, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            record = self.records.setdefault(url, FeedHealth())
+            record.consecutive_failures += 1
+            record.last_failure = now
+            record.last_error = error
+            if latency is not None:
+                record.last_latency = latency
+            if record.consecutive_failures >= self.failure_threshold:
+                exponent = record.consecutive_failures - self.failure_threshold
+                cooldown = min(self.max_cooldown, self.base_cooldown * (2 ** exponent))
+                record.open_until = now + cooldown
+                logger.warning(f"Opening circuit for {url} after {record.consecutive_failures} consecutive failures, skipping for {cooldown:.0f} seconds")
+
+    def save(self) -> None:
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {url: asdict(record) for url, record in self.records.items()}
+        write_json_atomic(self.state_path, state)
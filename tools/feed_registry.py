@@ -0,0 +1,211 @@
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional
+from xml.etree import ElementTree
+
+from logger import setup_logger
+from tools.atomic_file import write_json_atomic
+
+logger = setup_logger()
+
+# Runs are scheduled externally (cron), so allow a feed to be polled slightly early
+SCHEDULE_GRACE_SECONDS = 60.0
+# Adaptive polling: interval growth after a poll without new entries, weight of
+# each new cadence estimate, and how many recent entries the estimate uses
+BACKOFF_FACTOR = 1.5
+LEARNING_RATE = 0.5
+CADENCE_SAMPLE_SIZE = 10
+
+
+@dataclass
+class FeedConfig:
+    """Per-feed settings from the feed registry"""
+    url: str
+    name: str = ""
+    poll_interval: float = 0.0  # Seconds between polls, 0 polls on every run
+    max_items: Optional[int] = None  # Falls back to the tool's max_entries_per_feed
+    weight: float = 1.0  # Multiplies the relevance score of the feed's entries
+    timeout: Optional[float] = None  # Falls back to the tool's feed_timeout
+    enabled: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeedConfig":
+        """Build a FeedConfig from a registry record, rejecting unknown keys"""
+        if not isinstance(data, dict):
+            raise ValueError(f"Feed registry entries must be objects, got: {data!r}")
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown feed registry keys: {', '.join(sorted(unknown))}")
+        if not data.get("url"):
+            raise ValueError("Feed registry entry is missing 'url'")
+        config = cls(**data)
+        if config.poll_interval < 0:
+            raise ValueError(f"poll_interval must not be negative for {config.url}")
+        if config.weight < 0:
+            raise ValueError(f"weight must not be negative for {config.url}")
+        return config
+
+
+def load_opml(path: str, **defaults: Any) -> List[FeedConfig]:
+    """Load feed configs from an OPML subscription list
+
+    Every outline with an `xmlUrl` becomes a feed, however deeply it is
+    nested in folders. Duplicate URLs, common in exports, are dropped.
+    `defaults` are applied to every feed (e.g. poll_interval).
+    """
+    try:
+        root = ElementTree.parse(path).getroot()
+    except ElementTree.ParseError as e:
+        raise ValueError(f"Invalid OPML file {path}: {str(e)}")
+
+    configs = []
+    seen = set()
+    for outline in root.iter("outline"):
+        url = (outline.get("xmlUrl") or "").strip()
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        name = outline.get("title") or outline.get("text") or ""
+        configs.append(FeedConfig.from_dict({**defaults, "url": url, "name": name}))
+    if not configs:
+        raise ValueError(f"OPML file {path} contains no feeds")
+    return configs
+
+
+def load_feed_registry(path: str) -> List[FeedConfig]:
+    """Load feed configs from a JSON, YAML or OPML registry file
+
+    JSON/YAML files hold either a list of feed records or an object with a
+    `feeds` list. YAML requires PyYAML to be installed.
+    """
+    if path.endswith((".opml", ".xml")):
+        return load_opml(path)
+
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("PyYAML is required to load YAML feed registries (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    if isinstance(data, dict):
+        data = data.get("feeds")
+    if not isinstance(data, list):
+        raise ValueError(f"Feed registry {path} must contain a list of feeds")
+
+    configs = [FeedConfig.from_dict(record) for record in data]
+    urls = [config.url for config in configs]
+    if len(set(urls)) != len(urls):
+        raise ValueError(f"Feed registry {path} contains duplicate URLs")
+    return configs
+
+
+class FeedScheduler:
+    """Tracks when each feed was last polled and decides which feeds are due
+
+    With `adaptive` enabled the scheduler also learns a poll interval per
+    feed: polls that bring nothing new (304s or only old entries) back the
+    interval off, while polls with new entries move it towards half the
+    feed's observed publishing gap. Learned intervals are kept within
+    `min_interval` and `max_interval`. State is kept in a small JSON file so
+    schedules survive restarts.
+    """
+
+    def __init__(self, state_path: Optional[str] = None, adaptive: bool = False, min_interval: float = 900.0, max_interval: float = 86400.0):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Poll interval bounds must satisfy 0 < min_interval <= max_interval")
+        self.state_path = state_path
+        self.adaptive = adaptive
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.last_polled: Dict[str, float] = {}
+        self.learned_intervals: Dict[str, float] = {}
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    self._load_state(json.load(f))
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable schedule state {state_path}: {str(e)}")
+
+    def _load_state(self, data: Dict[str, Any]) -> None:
+        for url, record in data.items():
+            if isinstance(record, dict):
+                if "last_polled" in record:
+                    self.last_polled[url] = float(record["last_polled"])
+                if "interval" in record:
+                    self.learned_intervals[url] = float(record["interval"])
+            else:
+                # State files from before adaptive polling only held the last poll time
+                self.last_polled[url] = float(record)
+
+    def interval_for(self, config: FeedConfig) -> float:
+        """Return the poll interval in effect for a feed"""
+        if self.adaptive and config.url in self.learned_intervals:
+            return self.learned_intervals[config.url]
+        return config.poll_interval
+
+    def is_due(self, config: FeedConfig, now: Optional[float] = None) -> bool:
+        """Check whether an enabled feed's poll interval has elapsed"""
+        if not config.enabled:
+            return False
+        last = self.last_polled.get(config.url)
+        interval = self.interval_for(config)
+        if last is None or interval <= 0:
+            return True
+        now = time.time() if now is None else now
+        return now - last >= interval - SCHEDULE_GRACE_SECONDS
+
+    def due_feeds(self, configs: Iterable[FeedConfig], now: Optional[float] = None) -> List[FeedConfig]:
+        """Return the feeds that should be polled now, in registry order"""
+        now = time.time() if now is None else now
+        return [config for config in configs if self.is_due(config, now)]
+
+    def learn(self, config: FeedConfig, entry_times: Iterable[float], not_modified: bool = False) -> float:
+        """Update a feed's learned interval from a poll and return it
+
+        Must be called before the poll is recorded with `mark_polled`, since
+        entries newer than the previous poll are what count as new.
+        """
+        current = self.learned_intervals.get(config.url) or config.poll_interval or self.min_interval
+        last = self.last_polled.get(config.url)
+        times = sorted(entry_times)
+
+        if not_modified or (last is not None and not any(t > last for t in times)):
+            estimate = current * BACKOFF_FACTOR
+        else:
+            recent = times[-CADENCE_SAMPLE_SIZE:]
+            gaps = [b - a for a, b in zip(recent, recent[1:]) if b > a]
+            # Sample twice per publishing gap so new stories are picked up promptly
+            estimate = statistics.median(gaps) / 2 if gaps else current
+            estimate = current + LEARNING_RATE * (estimate - current)
+
+        interval = min(self.max_interval, max(self.min_interval, estimate))
+        self.learned_intervals[config.url] = interval
+        return interval
+
+    def mark_polled(self, urls: Iterable[str], now: Optional[float] = None) -> None:
+        """Record a successful poll of the given feeds and persist the state"""
+        now = time.time() if now is None else now
+        for url in urls:
+            self.last_polled[url] = now
+        self.save()
+
+    def save(self) -> None:
+        if not self.state_path:
+            return
+        state = {}
+        for url in set(self.last_polled) | set(self.learned_intervals):
+            record: Dict[str, float] = {}
+            if url in self.last_polled:
+                record["last_polled"] = self.last_polled[url]
+            if url in self.learned_intervals:
+                record["interval"] = self.learned_intervals[url]
+            state[url] = record
+        write_json_atomic(self.state_path, state)
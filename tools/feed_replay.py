@@ -0,0 +1,195 @@
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from logger import setup_logger
+from tools.atomic_file import write_atomic
+from tools.http_client import ACCEPT_ENCODING, USER_AGENT
+
+logger = setup_logger()
+
+# Headers that describe the wire format rather than the (decoded) recorded body
+_TRANSPORT_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"})
+
+
+@dataclass(frozen=True)
+class ReplayProfile:
+    """Simulated network conditions for replayed responses"""
+    latency: float = 0.0  # Mean seconds before a response is served
+    jitter: float = 0.0  # Latency varies uniformly by up to this many seconds either way
+    failure_rate: float = 0.0  # Share of requests failing with a connection error
+    error_rate: float = 0.0  # Share of requests answered with HTTP 503
+
+
+REPLAY_PROFILES: Dict[str, ReplayProfile] = {
+    "instant": ReplayProfile(),
+    "typical": ReplayProfile(latency=0.25, jitter=0.15),
+    "slow": ReplayProfile(latency=2.0, jitter=1.5),
+    "flaky": ReplayProfile(latency=0.25, jitter=0.15, failure_rate=0.1, error_rate=0.05),
+}
+
+
+class FeedFixtures:
+    """Directory of recorded responses, one body and one metadata file per URL
+
+    Files are named after the SHA-1 of the URL: `<hash>.json` holds the URL,
+    status and headers, `<hash>.body` the decoded response body.
+    """
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+
+    def _path(self, url: str, suffix: str) -> str:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.fixture_dir, f"{digest}{suffix}")
+
+    def save(self, url: str, status_code: int, headers: Dict[str, str], body: bytes) -> None:
+        """Record a response, dropping transport-level headers"""
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        meta = {
+            "url": url,
+            "status": status_code,
+            "headers": {k.lower(): v for k, v in headers.items() if k.lower() not in _TRANSPORT_HEADERS},
+            "recorded_at": time.time(),
+        }
+        write_atomic(self._path(url, ".body"), body)
+        write_atomic(self._path(url, ".json"), json.dumps(meta, indent=1).encode("utf-8"))
+
+    def load(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Return (status, headers, body) recorded for `url`, or None"""
+        try:
+            with open(self._path(url, ".json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._path(url, ".body"), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        return meta["status"], meta["headers"], body
+
+    def urls(self) -> List[str]:
+        """Return the recorded URLs, sorted"""
+        if not os.path.isdir(self.fixture_dir):
+            return []
+        urls = []
+        for name in os.listdir(self.fixture_dir):
+            if name.endswith(".json"):
+                with open(os.path.join(self.fixture_dir, name), "r", encoding="utf-8") as f:
+                    urls.append(json.load(f)["url"])
+        return sorted(urls)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that performs real requests and records every response"""
+
+    def __init__(self, fixtures: FeedFixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # Reading the body here keeps it available to streaming consumers via iter_content
+        body = response.content
+        if response.status_code != 304:
+            self.fixtures.save(request.url, response.status_code, dict(response.headers), body)
+            logger.debug(f"Recorded {len(body)} bytes from {request.url}")
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that serves recorded responses under a simulated profile
+
+    Conditional requests matching the recorded ETag or Last-Modified are
+    answered with 304. Latency and failures are drawn from a random stream
+    seeded per URL and request number, so runs are reproducible regardless
+    of thread scheduling.
+    """
+
+    def __init__(self, fixtures: FeedFixtures, profile: ReplayProfile = ReplayProfile(), seed: int = 0):
+        super().__init__()
+        self.fixtures = fixtures
+        self.profile = profile
+        self.seed = seed
+        self._request_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _random(self, url: str) -> random.Random:
+        with self._lock:
+            count = self._request_counts.get(url, 0)
+            self._request_counts[url] = count + 1
+        return random.Random(f"{self.seed}:{url}:{count}")
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        rng = self._random(request.url)
+        delay = max(0.0, self.profile.latency + rng.uniform(-self.profile.jitter, self.profile.jitter))
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.ReadTimeout(f"Simulated timeout after {read_timeout}s for {request.url}", request=request)
+        time.sleep(delay)
+
+        roll = rng.random()
+        if roll < self.profile.failure_rate:
+            raise requests.ConnectionError(f"Simulated connection failure for {request.url}", request=request)
+
+        recorded = self.fixtures.load(request.url)
+        if recorded is None:
+            raise requests.ConnectionError(f"No recorded response for {request.url}", request=request)
+        status, headers, body = recorded
+
+        if roll < self.profile.failure_rate + self.profile.error_rate:
+            status, body = 503, b""
+        elif status == 200 and self._not_modified(request, headers):
+            status, body = 304, b""
+        return self._build_response(request, status, headers, body)
+
+    @staticmethod
+    def _not_modified(request, headers: Dict[str, str]) -> bool:
+        etag = request.headers.get("If-None-Match")
+        modified = request.headers.get("If-Modified-Since")
+        return bool((etag and etag == headers.get("etag")) or (modified and modified == headers.get("last-modified")))
+
+    @staticmethod
+    def _build_response(request, status: int, headers: Dict[str, str], body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers["Content-Length"] = str(len(body))
+        response.raw = io.BytesIO(body)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        return response
+
+    def close(self):
+        pass
+
+
+def _session_with(adapter: BaseAdapter) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+    return session
+
+
+def recording_session(fixture_dir: str, max_connections_per_host: int = 4) -> requests.Session:
+    """Return a pooled session that records every response into `fixture_dir`"""
+    adapter = RecordingAdapter(FeedFixtures(fixture_dir), pool_connections=32, pool_maxsize=max_connections_per_host, pool_block=True)
+    return _session_with(adapter)
+
+
+def replay_session(fixture_dir: str, profile: ReplayProfile = ReplayProfile(), seed: int = 0) -> requests.Session:
+    """Return a session that serves responses recorded in `fixture_dir`"""
+    return _session_with(ReplayAdapter(FeedFixtures(fixture_dir), profile=profile, seed=seed))
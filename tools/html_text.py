@@ -0,0 +1,80 @@
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Elements whose content is never readable text
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "iframe", "object", "svg", "template", "head"})
+# Elements that separate words even without surrounding whitespace
+_BLOCK_TAGS = frozenset({
+    "p", "div", "br", "li", "ul", "ol", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6",
+    "blockquote", "section", "article", "header", "footer", "figure", "figcaption", "pre", "hr",
+})
+_CHUNK_SIZE = 4096
+
+
+class _TextExtractor(HTMLParser):
+    """Collects visible text, dropping scripts, styles and embedded media"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.length = 0
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags (<br/>, <img/> tracking pixels) never open a skip block
+        if tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+            self.length += len(data)
+
+
+def truncate_words(text: str, max_chars: int, suffix: str = "...") -> str:
+    """Truncate text to at most `max_chars`, cutting on a word boundary"""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars - len(suffix)]
+    space = cut.rfind(" ")
+    if text[len(cut)] != " " and space > 0:
+        cut = cut[:space]
+    return cut.rstrip(" ,.;:-") + suffix
+
+
+def html_to_text(html: str, max_chars: Optional[int] = None) -> str:
+    """Convert an HTML fragment into normalized plain text
+
+    Entities are decoded, scripts/styles/images are dropped and whitespace is
+    collapsed. With `max_chars`, parsing stops as soon as enough text has
+    been collected and the result is truncated on a word boundary.
+    """
+    if "<" not in html and "&" not in html:
+        text = " ".join(html.split())
+    else:
+        parser = _TextExtractor()
+        # Keep a margin so whitespace collapsing doesn't leave us short
+        needed = max_chars * 2 if max_chars else None
+        for start in range(0, len(html), _CHUNK_SIZE):
+            parser.feed(html[start:start + _CHUNK_SIZE])
+            if needed and parser.length >= needed:
+                break
+        parser.close()
+        text = " ".join("".join(parser.parts).split())
+
+    if max_chars:
+        text = truncate_words(text, max_chars)
+    return text
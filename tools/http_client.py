@@ -0,0 +1,109 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+USER_AGENT = "crewai-python-publisher/1.0 (+https://github.com/ekinbulut/crewai-python-publisher)"
+
+# Advertise only the encodings urllib3 can decode here (br/zstd when their packages are installed)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+_sessions: Dict[Tuple[int, int], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _reset_sessions_after_fork() -> None:
+    """Give forked worker processes their own pools
+
+    Pooled keep-alive sockets inherited from the parent would otherwise be
+    shared by both processes and interleave their responses.
+    """
+    global _sessions_lock
+    _sessions.clear()
+    _sessions_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_sessions_after_fork)
+
+
+class ResponseTooLarge(ValueError):
+    """Raised when a response body exceeds the configured size limit"""
+
+
+class FetchResponse(NamedTuple):
+    status_code: int
+    headers: Dict[str, str]  # Lowercased header names
+    content: bytes
+    url: str
+
+
+def get_shared_session(pool_connections: int = 32, max_connections_per_host: int = 4) -> requests.Session:
+    """Return a process-wide pooled session for the given pool settings
+
+    Connections are kept alive and reused across fetches and threads; at most
+    `max_connections_per_host` connections are open to any one host, extra
+    requests wait for a free connection instead of opening new ones.
+    """
+    key = (pool_connections, max_connections_per_host)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=max_connections_per_host, pool_block=True)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+            _sessions[key] = session
+        return session
+
+
+class StreamingResponse(NamedTuple):
+    status_code: int
+    headers: Dict[str, str]  # Lowercased header names
+    chunks: Iterator[bytes]  # Decoded body chunks, bounded by max_bytes
+    url: str
+
+
+def _bounded_chunks(response: requests.Response, url: str, max_bytes: Optional[int], chunk_size: int) -> Iterator[bytes]:
+    size = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            raise ResponseTooLarge(f"Response from {url} exceeds {max_bytes} bytes")
+        yield chunk
+
+
+@contextmanager
+def stream(session: requests.Session, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, max_bytes: Optional[int] = None, chunk_size: int = 16 * 1024) -> Iterator[StreamingResponse]:
+    """GET a URL and expose its body as a bounded chunk iterator
+
+    Leaving the context closes the response, so a consumer that stops
+    reading early does not download the rest of the body.
+    """
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        declared = response.headers.get("Content-Length")
+        encoded = response.headers.get("Content-Encoding", "identity") != "identity"
+        if max_bytes and declared and declared.isdigit() and not encoded and int(declared) > max_bytes:
+            raise ResponseTooLarge(f"Response from {url} is {declared} bytes, limit is {max_bytes}")
+        yield StreamingResponse(
+            status_code=response.status_code,
+            headers={k.lower(): v for k, v in response.headers.items()},
+            chunks=_bounded_chunks(response, url, max_bytes, chunk_size),
+            url=response.url,
+        )
+
+
+def fetch(session: requests.Session, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, max_bytes: Optional[int] = None) -> FetchResponse:
+    """GET a URL through `session`, reading at most `max_bytes` of (decoded) body"""
+    with stream(session, url, headers=headers, timeout=timeout, max_bytes=max_bytes, chunk_size=64 * 1024) as response:
+        return FetchResponse(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=b"".join(response.chunks),
+            url=response.url,
+        )
@@ -0,0 +1,64 @@
+import calendar
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class NewsEntry:
+    """Normalized news item selected from a feed"""
+    title: str
+    link: str
+    summary: str
+    source: str = ""
+    guid: Optional[str] = None
+    published: Optional[datetime] = None
+    related_links: Tuple[str, ...] = ()
+    content: Optional[str] = None  # Main text of the linked article, when extracted
+
+    @classmethod
+    def from_feed_entry(cls, entry: Dict[str, Any], source: str, summary: str) -> "NewsEntry":
+        """Build a NewsEntry from a feedparser entry"""
+        published = entry.get('published_parsed') or entry.get('updated_parsed')
+        return cls(
+            title=' '.join(str(entry.get("title") or "No title").split()),
+            link=str(entry.get("link") or "No link").strip(),
+            summary=summary,
+            source=source,
+            guid=entry.get("id"),
+            published=datetime.fromtimestamp(calendar.timegm(published), tz=timezone.utc) if published else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable dict, omitting empty optional fields"""
+        data: Dict[str, Any] = {"title": self.title, "link": self.link, "summary": self.summary}
+        if self.source:
+            data["source"] = self.source
+        if self.published:
+            data["published"] = self.published.isoformat()
+        if self.related_links:
+            data["related_links"] = list(self.related_links)
+        if self.content:
+            data["content"] = self.content
+        return data
+
+    def render_text(self) -> str:
+        """Render the entry in the text format handed to the agents"""
+        text = f"Title: {self.title}\nLink: {self.link}\n"
+        if self.related_links:
+            text += f"Also covered by: {', '.join(self.related_links)}\n"
+        text += f"Summary: {self.summary}\n"
+        if self.content:
+            text += f"Article: {self.content}\n"
+        return text
+
+
+def render_text(entries: Iterable[NewsEntry]) -> str:
+    """Render entries as text items separated by `---`"""
+    return "\n---\n".join(entry.render_text() for entry in entries)
+
+
+def render_json(entries: Iterable[NewsEntry]) -> str:
+    """Render entries as a compact JSON array"""
+    return json.dumps([entry.to_dict() for entry in entries], ensure_ascii=False, separators=(",", ":"))
@@ -1,32 +1,209 @@
 from crewai.tools import BaseTool
 from pydantic import Field
+from dataclasses import replace
 import feedparser
+import requests
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from logger import setup_logger
+from tools.feed_cache import FeedCache
+from tools.seen_index import SeenIndex
+from tools.dedup import NearDuplicateDetector
+from tools.news_entry import NewsEntry, render_json, render_text
+from tools.ranking import BM25Scorer, DEFAULT_TOPIC_QUERY
+from tools.text import tokenize
+from tools.token_budget import TokenBudget, estimate_tokens
+from tools.html_text import html_to_text, truncate_words
+from tools.feed_registry import FeedConfig, FeedScheduler, load_feed_registry
+from tools.feed_health import FeedHealth, FeedHealthTracker
+from tools.http_client import get_shared_session, stream
+from tools.stream_parser import parse_stream
+from tools.recency import entry_timestamp, filter_recent, recency_cutoff
+from tools.article_cache import ArticleCache
+from tools.article_extractor import ArticleExtractor
+from tools.extractive_summary import SUMMARIZERS
+from tools.feed_replay import REPLAY_PROFILES, recording_session, replay_session
+from tools.websub import WebSubSubscriber, discover_hub
+from tools.topic_clusters import THEME_LABEL_TERMS, TopicGroup, group_by_topic, render_groups_json, render_groups_text
 import time
-from datetime import datetime, timezone, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Literal, NamedTuple, Optional, Tuple
 
 logger = setup_logger()
 
+DEFAULT_FEEDS = [
+    'https://techcrunch.com/feed/',
+    'https://www.theverge.com/rss/index.xml',
+    'https://www.wired.com/feed/rss'
+]
+
+# Extra time given to worker processes beyond fetch_deadline to start up and return results
+SHARD_DEADLINE_MARGIN = 10.0
+# Article text that would have to be cut shorter than this to fit the token budget is left out
+MIN_ARTICLE_CHARS = 200
+
+
+class FeedResult(NamedTuple):
+    """Outcome of fetching and normalizing one feed"""
+    config: FeedConfig
+    fetched: bool
+    items: Optional[List[NewsEntry]]
+    timestamps: List[float]
+    not_modified: bool
+    health: Optional[FeedHealth] = None  # Set when fetched in a worker process
+    hub: Optional[Tuple[str, Optional[str]]] = None  # WebSub (hub, self URL) advertised by the feed
+
 class RSSNewsFetcherTool(BaseTool):
     name: str = Field(default="rss_news_fetcher")
     description: str = Field(default="Fetches the latest IT news headlines and summaries from popular RSS feeds")
+    feeds: List[str] = Field(default_factory=lambda: list(DEFAULT_FEEDS), description="RSS/Atom feed URLs to fetch when no registry is configured")
+    registry_path: Optional[str] = Field(default=None, description="JSON/YAML feed registry with per-feed settings; replaces `feeds` when set")
+    schedule_state_path: Optional[str] = Field(default=".cache/schedule.json", description="Where last-poll times are kept for the feed scheduler")
+    adaptive_polling: bool = Field(default=False, description="Learn each feed's poll interval from its publishing cadence and 304 rate")
+    min_poll_interval: float = Field(default=900.0, description="Lower bound in seconds for learned poll intervals")
+    max_poll_interval: float = Field(default=86400.0, description="Upper bound in seconds for learned poll intervals")
+    max_workers: int = Field(default=8, description="Maximum number of feeds fetched concurrently (1 fetches serially)")
+    feed_timeout: float = Field(default=10.0, description="Per-feed connect/read timeout in seconds")
+    fetch_deadline: float = Field(default=30.0, description="Overall deadline in seconds for fetching all feeds")
+    process_workers: int = Field(default=0, description="Shard feeds across this many worker processes (0 or 1 fetches in-process)")
+    max_connections_per_host: int = Field(default=4, description="Pooled keep-alive connections allowed per feed host")
+    replay_mode: Literal["off", "record", "replay"] = Field(default="off", description="Record feed responses to replay_dir, or serve them from there instead of the network")
+    replay_dir: str = Field(default=".cache/replay", description="Fixture directory for recorded feed responses")
+    replay_profile: Literal["instant", "typical", "slow", "flaky"] = Field(default="instant", description="Simulated latency and failure profile for replayed responses")
+    replay_seed: int = Field(default=0, description="Seed for the simulated latency and failures of replayed responses")
+    max_feed_bytes: int = Field(default=5_000_000, description="Largest decompressed feed body accepted, in bytes")
+    recency_hours: float = Field(default=24.0, description="Only entries published within this many hours are considered")
+    streaming_parse: bool = Field(default=False, description="Parse feeds incrementally and stop reading once enough recent entries are collected")
+    stream_entry_limit: int = Field(default=20, description="Recent entries collected per feed before a streaming parse stops")
+    cache_dir: Optional[str] = Field(default=".cache/feeds", description="Directory for the conditional-GET feed cache (None disables it)")
+    seen_db_path: Optional[str] = Field(default=".cache/seen.sqlite3", description="SQLite index of already processed articles (None disables it)")
+    seen_ttl_hours: float = Field(default=72.0, description="How long a processed article is remembered")
+    seen_bloom: bool = Field(default=True, description="Keep an in-memory Bloom filter in front of the seen index")
+    health_state_path: Optional[str] = Field(default=".cache/feed_health.json", description="Where per-feed health and circuit breaker state is kept")
+    websub_port: Optional[int] = Field(default=None, description="Run a WebSub callback endpoint on this port and subscribe to hubs advertised by feeds (None disables, 0 picks a free port)")
+    websub_host: str = Field(default="127.0.0.1", description="Interface the WebSub callback endpoint listens on")
+    websub_callback_url: Optional[str] = Field(default=None, description="Public URL hubs reach the callback endpoint at (defaults to the local address)")
+    websub_secret: Optional[str] = Field(default=None, description="Secret hubs must sign pushed content with")
+    websub_lease_seconds: float = Field(default=86400.0, description="Requested WebSub subscription lease in seconds; longer leases granted by hubs are capped to it")
+    breaker_failure_threshold: int = Field(default=3, description="Consecutive failures before a feed's circuit opens")
+    breaker_base_cooldown: float = Field(default=600.0, description="Seconds a feed is skipped when its circuit first opens; doubles on each further failure")
+    breaker_max_cooldown: float = Field(default=86400.0, description="Upper bound in seconds for a feed's circuit breaker cooldown")
+    dedup_threshold: Optional[float] = Field(default=0.6, description="Word-bigram Jaccard similarity at which stories from different feeds are collapsed (None disables it)")
+    topic_query: Optional[str] = Field(default=DEFAULT_TOPIC_QUERY, description="Topic query entries are ranked against (None keeps feed order)")
+    max_items: int = Field(default=9, description="Maximum number of news items returned across all feeds")
+    max_entries_per_feed: int = Field(default=3, description="Maximum number of news items taken from a single feed")
+    token_budget: Optional[int] = Field(default=1500, description="Maximum estimated LLM tokens in the rendered output (None disables it)")
+    output_format: Literal["text", "json"] = Field(default="text", description="Render news items as agent-facing text or as a JSON array")
+    extract_articles: bool = Field(default=False, description="Fetch each selected item's article page and add its main text")
+    article_cache_dir: Optional[str] = Field(default=".cache/articles", description="Directory for extracted article text (None disables caching)")
+    article_cache_max_age: Optional[float] = Field(default=259200.0, description="Seconds extracted article text stays cached; older files are removed when the cache is opened (None keeps them)")
+    article_workers: int = Field(default=4, description="Maximum number of article pages fetched concurrently")
+    article_host_concurrency: int = Field(default=1, description="Article requests allowed in flight per host")
+    article_host_delay: float = Field(default=1.0, description="Minimum seconds between article requests to the same host")
+    article_max_chars: int = Field(default=4000, description="Longest article text added to an item, in characters; trimmed further to fit token_budget")
+    group_topics: bool = Field(default=False, description="Group the output into themes of related stories, each with a representative headline")
+    topic_similarity: float = Field(default=0.2, description="Average TF-IDF cosine similarity at which stories are grouped into one theme")
+    summary_sentences: Optional[int] = Field(default=None, description="Cut summaries and article text to K sentences before they reach the agents (None keeps them whole)")
+    summary_method: Literal["lead", "textrank"] = Field(default="lead", description="How summary_sentences picks sentences: the first K (lead) or the K most central (textrank)")
+    _feed_cache: Optional[FeedCache] = None
+    _seen_index: Optional[SeenIndex] = None
+    _scheduler: Optional[FeedScheduler] = None
+    _health: Optional[FeedHealthTracker] = None
+    _article_extractor: Optional[ArticleExtractor] = None
+    _replay_session: Optional[requests.Session] = None
+    _websub: Optional[WebSubSubscriber] = None
+    _pending: Optional[List[NewsEntry]] = None  # Returned by _run until marked processed
+
+    def _get_feed_cache(self) -> Optional[FeedCache]:
+        """Return the feed cache, creating it on first use"""
+        if not self.cache_dir:
+            return None
+        if self._feed_cache is None:
+            self._feed_cache = FeedCache(self.cache_dir)
+        return self._feed_cache
+
+    def _get_seen_index(self) -> Optional[SeenIndex]:
+        """Return the seen-article index, opening it on first use"""
+        if not self.seen_db_path:
+            return None
+        if self._seen_index is None:
+            self._seen_index = SeenIndex(self.seen_db_path, ttl_seconds=self.seen_ttl_hours * 3600, use_bloom=self.seen_bloom)
+        return self._seen_index
+
+    def _get_scheduler(self) -> FeedScheduler:
+        """Return the feed scheduler, loading its state on first use"""
+        if self._scheduler is None:
+            self._scheduler = FeedScheduler(
+                self.schedule_state_path,
+                adaptive=self.adaptive_polling,
+                min_interval=self.min_poll_interval,
+                max_interval=self.max_poll_interval,
+            )
+        return self._scheduler
+
+    def _get_health_tracker(self) -> FeedHealthTracker:
+        """Return the feed health tracker, loading its state on first use"""
+        if self._health is None:
+            self._health = FeedHealthTracker(
+                self.health_state_path,
+                failure_threshold=self.breaker_failure_threshold,
+                base_cooldown=self.breaker_base_cooldown,
+                max_cooldown=self.breaker_max_cooldown,
+            )
+        return self._health
+
+    def _get_session(self) -> requests.Session:
+        """Return the session feeds are fetched through: shared and pooled, or recording/replaying"""
+        if self.replay_mode == "off":
+            return get_shared_session(max_connections_per_host=self.max_connections_per_host)
+        if self._replay_session is None:
+            if self.replay_mode == "record":
+                self._replay_session = recording_session(self.replay_dir, self.max_connections_per_host)
+            else:
+                self._replay_session = replay_session(self.replay_dir, REPLAY_PROFILES[self.replay_profile], seed=self.replay_seed)
+        return self._replay_session
+
+    def _get_websub(self) -> Optional[WebSubSubscriber]:
+        """Return the WebSub subscriber, starting its callback endpoint on first use"""
+        if self.websub_port is None:
+            return None
+        if self._websub is None:
+            self._websub = WebSubSubscriber(
+                host=self.websub_host,
+                port=self.websub_port,
+                callback_url=self.websub_callback_url,
+                secret=self.websub_secret,
+                lease_seconds=self.websub_lease_seconds,
+                timeout=self.feed_timeout,
+            )
+        return self._websub
+
+    def _get_article_extractor(self) -> ArticleExtractor:
+        """Return the article extractor, creating it on first use"""
+        if self._article_extractor is None:
+            self._article_extractor = ArticleExtractor(
+                cache=ArticleCache(self.article_cache_dir, max_age=self.article_cache_max_age) if self.article_cache_dir else None,
+                max_workers=self.article_workers,
+                host_concurrency=self.article_host_concurrency,
+                host_delay=self.article_host_delay,
+                timeout=self.feed_timeout,
+                max_chars=self.article_max_chars,
+            )
+        return self._article_extractor
+
+    def _feed_configs(self) -> List[FeedConfig]:
+        """Return the configured feeds, from the registry file if one is set"""
+        if self.registry_path:
+            return load_feed_registry(self.registry_path)
+        return [FeedConfig(url=url) for url in self.feeds]
+
+    def _entry_timestamps(self, feed: feedparser.FeedParserDict) -> List[float]:
+        """Return the UTC publish times of a feed's entries as epoch seconds"""
+        timestamps = (entry_timestamp(entry) for entry in feed.entries)
+        return [ts for ts in timestamps if ts is not None]
 
     def _is_recent(self, entry: Dict[str, Any]) -> bool:
-        """Check if an entry is from the last 24 hours"""
-        try:
-            # Try to get the published time
-            published = entry.get('published_parsed') or entry.get('updated_parsed')
-            if not published:
-                return True  # If we can't determine the date, include it
-            
-            entry_date = datetime.fromtimestamp(time.mktime(published), tz=timezone.utc)
-            cutoff_date = datetime.now(timezone.utc) - timedelta(hours=24)
-            
-            return entry_date >= cutoff_date
-        except Exception as e:
-            logger.warning(f"Error checking entry date: {str(e)}")
-            return True  # Include entries where we can't determine the date
+        """Check if an entry is from the last `recency_hours` hours"""
+        return bool(filter_recent([entry], recency_cutoff(self.recency_hours)))
 
     def _get_entry_summary(self, entry: Dict[str, Any]) -> str:
         """Extract and clean up entry summary"""
@@ -51,12 +228,9 @@ class RSSNewsFetcherTool(BaseTool):
             
             # Clean up the summary
             if isinstance(summary, str):
-                # Remove newlines and extra spaces
-                summary = ' '.join(summary.split())
-                # Truncate if too long
-                if len(summary) > 500:
-                    summary = summary[:497] + "..."
-                return summary
+                # Strip markup, decode entities and truncate on a word boundary
+                summary = html_to_text(summary, max_chars=500)
+                return summary or "No summary available"
             else:
                 return "Summary format not supported"
                 
@@ -64,60 +238,459 @@ class RSSNewsFetcherTool(BaseTool):
             logger.warning(f"Error extracting summary: {str(e)}")
             return "Error extracting summary"
 
+    def _fetch_feed(self, url: str, timeout: Optional[float] = None) -> feedparser.FeedParserDict:
+        """Download a single feed through the feed session and parse it
+
+        When the feed is cached, a conditional GET is sent with the stored
+        ETag/Last-Modified validators and a 304 serves the cached entries
+        without downloading or parsing the document again.
+        """
+        cache = self._get_feed_cache()
+        cached = cache.get(url) if cache else None
+
+        headers = {}
+        if cached:
+            headers.update(cached.conditional_headers())
+
+        with stream(self._get_session(), url, headers=headers, timeout=timeout or self.feed_timeout, max_bytes=self.max_feed_bytes) as response:
+            if response.status_code == 304 and cached:
+                logger.info(f"Feed not modified, serving {len(cached.entries)} cached entries: {url}")
+                return cached.to_feed()
+            if response.status_code >= 400:
+                raise requests.HTTPError(f"HTTP {response.status_code} fetching {url}")
+
+            if self.streaming_parse:
+                cutoff = recency_cutoff(self.recency_hours)
+                feed = parse_stream(response.chunks, max_entries=self.stream_entry_limit, cutoff=cutoff)
+            else:
+                feed = feedparser.parse(b"".join(response.chunks), response_headers=response.headers)
+
+        etag = response.headers.get('etag')
+        modified = response.headers.get('last-modified')
+        if cache and not feed.bozo and (etag or modified):
+            try:
+                cache.set(url, etag, modified, feed.entries)
+            except Exception as cache_error:
+                logger.warning(f"Could not cache feed {url}: {str(cache_error)}")
+        return feed
+
+    def _fetch_with_health(self, url: str, timeout: Optional[float], deadline_passed: threading.Event) -> feedparser.FeedParserDict:
+        """Fetch a feed and record the outcome in its health record
+
+        Outcomes arriving after the fetch deadline are not recorded; the
+        caller has already counted those feeds as failed.
+        """
+        health = self._get_health_tracker()
+        started = time.monotonic()
+        try:
+            feed = self._fetch_feed(url, timeout)
+        except Exception as e:
+            if not deadline_passed.is_set():
+                health.record_failure(url, str(e), time.monotonic() - started)
+            raise
+
+        if not deadline_passed.is_set():
+            latency = time.monotonic() - started
+            if feed.bozo:
+                health.record_failure(url, f"Malformed feed: {feed.bozo_exception}", latency)
+            else:
+                health.record_success(url, latency)
+        return feed
+
+    def _fetch_feeds(self, feeds: List[FeedConfig]) -> List[Optional[feedparser.FeedParserDict]]:
+        """Fetch feeds concurrently and return parsed results in the same order as `feeds`
+
+        Feeds that fail, time out or are still pending when the overall deadline
+        expires are returned as None.
+        """
+        results: List[Optional[feedparser.FeedParserDict]] = [None] * len(feeds)
+        if not feeds:
+            return results
+
+        workers = max(1, min(self.max_workers, len(feeds)))
+        deadline_passed = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss-fetch")
+        futures = {pool.submit(self._fetch_with_health, feed.url, feed.timeout, deadline_passed): index for index, feed in enumerate(feeds)}
+        try:
+            for future in as_completed(futures, timeout=self.fetch_deadline):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as feed_error:
+                    logger.error(f"Error fetching feed {feeds[index].url}: {str(feed_error)}")
+        except FuturesTimeoutError:
+            deadline_passed.set()
+            health = self._get_health_tracker()
+            for future, index in futures.items():
+                # Feeds still queued never got a chance, only running ones count as failed
+                if future.running():
+                    health.record_failure(feeds[index].url, "Fetch deadline exceeded")
+            pending = [feeds[index].url for future, index in futures.items() if not future.done()]
+            logger.warning(f"Fetch deadline of {self.fetch_deadline:.1f}s exceeded, skipping {len(pending)} feeds: {', '.join(pending)}")
+        finally:
+            # Don't block on stragglers; their sockets are bounded by feed_timeout
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    def _process_feed(self, url: str, feed: Optional[feedparser.FeedParserDict], cutoff: float) -> Optional[List[NewsEntry]]:
+        """Select news items from a parsed feed, or None if the feed is unusable"""
+        if feed is None:
+            return None
+
+        if feed.bozo:  # feedparser sets this flag for malformed feeds
+            logger.warning(f"Feed may be malformed: {url}, Error: {feed.bozo_exception}")
+            return None
+
+        if not feed.entries:
+            logger.warning(f"No entries found in feed: {url}")
+            return None
+
+        # Filter for recent entries not handled by an earlier run
+        recent_entries = filter_recent(feed.entries, cutoff)
+        seen_index = self._get_seen_index()
+        if seen_index:
+            new_entries = [e for e in recent_entries if not seen_index.is_seen(e)]
+            if len(new_entries) < len(recent_entries):
+                logger.info(f"Skipping {len(recent_entries) - len(new_entries)} already processed entries from {url}")
+            recent_entries = new_entries
+
+        logger.info(f"Successfully fetched {len(recent_entries)} recent entries from {url}")
+        return [NewsEntry.from_feed_entry(entry, url, self._get_entry_summary(entry)) for entry in recent_entries]
+
+    def _collapse_duplicates(self, items: List[NewsEntry]) -> List[NewsEntry]:
+        """Collapse repeated and near-duplicate stories into their first occurrence
+
+        Items with an already collected link (the same article listed by
+        several feeds) are dropped. Near-duplicates keep the representative's
+        own link and list the links of the stories it replaced in
+        `related_links`.
+        """
+        links = set()
+        unique = []
+        for item in items:
+            if item.link not in links:
+                links.add(item.link)
+                unique.append(item)
+        items = unique
+
+        if self.dedup_threshold is None or len(items) < 2:
+            return items
+
+        detector = NearDuplicateDetector(threshold=self.dedup_threshold)
+        clusters = detector.cluster([f"{item.title}\n{item.summary}" for item in items])
+
+        collapsed = []
+        for members in clusters:
+            representative = items[members[0]]
+            if len(members) > 1:
+                representative = replace(representative, related_links=tuple(items[i].link for i in members[1:]))
+            collapsed.append(representative)
+
+        if len(collapsed) < len(items):
+            logger.info(f"Collapsed {len(items) - len(collapsed)} near-duplicate stories")
+        return collapsed
+
+    def _select_entries(self, items: List[NewsEntry], configs: Dict[str, FeedConfig]) -> List[NewsEntry]:
+        """Pick the most relevant items across all feeds
+
+        Items are ranked by BM25 against `topic_query`, scaled by their feed's
+        weight (ties keep feed order), and packed best-first, at most the
+        feed's `max_items` (default `max_entries_per_feed`) per feed and
+        `max_items` in total. With a `token_budget`, items whose rendered form
+        no longer fits are skipped in favour of smaller, lower-ranked ones.
+        """
+        weights = [configs[item.source].weight if item.source in configs else 1.0 for item in items]
+        order = list(range(len(items)))
+        if self.topic_query:
+            # Count the title twice so headlines outweigh boilerplate in summaries
+            scores = BM25Scorer(self.topic_query).score([f"{item.title} {item.title} {item.summary}" for item in items])
+            order.sort(key=lambda i: (-scores[i] * weights[i], -weights[i]))
+        else:
+            order.sort(key=lambda i: -weights[i])
+
+        budget = TokenBudget(self.token_budget) if self.token_budget else None
+        selected = []
+        per_feed: Dict[str, int] = {}
+        for index in order:
+            if len(selected) >= self.max_items:
+                break
+            item = items[index]
+            config = configs.get(item.source)
+            feed_limit = config.max_items if config and config.max_items is not None else self.max_entries_per_feed
+            if per_feed.get(item.source, 0) >= feed_limit:
+                continue
+            if budget and not budget.try_spend(self._estimate_item_tokens(item)):
+                continue
+            per_feed[item.source] = per_feed.get(item.source, 0) + 1
+            selected.append(item)
+
+        if budget:
+            logger.info(f"Selected {len(selected)} items using ~{budget.used}/{budget.limit} tokens")
+        return selected
+
+    def _estimate_item_tokens(self, item: NewsEntry) -> int:
+        """Estimate the tokens an item adds to the rendered output, separator included
+
+        With `group_topics` every item is budgeted as if it led its own theme,
+        so the theme headers always fit, whatever grouping comes out.
+        """
+        if self.group_topics:
+            # Stand-in label: the theme is labelled with terms of its entries, at worst the longest ones
+            terms = sorted({token for token in tokenize(f"{item.title} {item.summary}") if not token.isdigit()}, key=lambda token: (-len(token), token))
+            group = TopicGroup(label=tuple(terms[:THEME_LABEL_TERMS]), headline=item.title, entries=(item,))
+            if self.output_format == "json":
+                return estimate_tokens(render_groups_json([group])) + 1
+            return estimate_tokens(group.render_text()) + 3
+        if self.output_format == "json":
+            return estimate_tokens(render_json([item])) + 1
+        return estimate_tokens(item.render_text()) + 3
+
+    def _condense_entries(self, items: List[NewsEntry]) -> List[NewsEntry]:
+        """Cut summaries and article text down to `summary_sentences` sentences picked by `summary_method`"""
+        summarize = SUMMARIZERS[self.summary_method]
+        condensed = []
+        for item in items:
+            summary = summarize(item.summary, self.summary_sentences)
+            content = summarize(item.content, self.summary_sentences) if item.content else item.content
+            condensed.append(replace(item, summary=summary, content=content))
+        return condensed
+
+    def _attach_articles(self, items: List[NewsEntry]) -> List[NewsEntry]:
+        """Add the main text of each item's linked article, where it could be extracted"""
+        links = [item.link for item in items if item.link.startswith(("http://", "https://"))]
+        texts = self._get_article_extractor().extract_many(links, deadline=self.fetch_deadline)
+        return [replace(item, content=texts[item.link]) if item.link in texts else item for item in items]
+
+    def _fit_articles(self, items: List[NewsEntry]) -> List[NewsEntry]:
+        """Trim article text so the rendered output stays within `token_budget`
+
+        Selection only budgets the items without their articles. What is left
+        of the budget goes to the articles best-first: each keeps as much of
+        its text as still fits, and articles cut below `MIN_ARTICLE_CHARS`
+        are dropped.
+        """
+        if not self.token_budget:
+            return items
+        bare = [replace(item, content=None) for item in items]
+        remaining = self.token_budget - sum(self._estimate_item_tokens(item) for item in bare)
+        fitted = []
+        for item, base in zip(items, bare):
+            content = item.content
+            base_tokens = self._estimate_item_tokens(base)
+            while content:
+                cost = self._estimate_item_tokens(replace(base, content=content)) - base_tokens
+                if cost <= remaining:
+                    break
+                max_chars = int(len(content) * max(remaining, 0) / cost) - 1
+                content = truncate_words(content, max_chars) if max_chars >= MIN_ARTICLE_CHARS else None
+            if content:
+                remaining -= self._estimate_item_tokens(replace(base, content=content)) - base_tokens
+                fitted.append(replace(item, content=content))
+            else:
+                fitted.append(base)
+        return fitted
+
+    def _collect_feeds(self, feeds: List[FeedConfig], cutoff: float) -> List[FeedResult]:
+        """Fetch and normalize feeds in this process"""
+        results = []
+        for config, feed in zip(feeds, self._fetch_feeds(feeds)):
+            items = None
+            try:
+                items = self._process_feed(config.url, feed, cutoff)
+            except Exception as feed_error:
+                logger.error(f"Error processing feed {config.url}: {str(feed_error)}")
+            fetched = feed is not None
+            results.append(FeedResult(
+                config=config,
+                fetched=fetched,
+                items=items,
+                timestamps=self._entry_timestamps(feed) if fetched and self.adaptive_polling else [],
+                not_modified=fetched and feed.get('status') == 304,
+                hub=discover_hub(feed) if fetched else None,
+            ))
+        return results
+
+    def _collect_pushed(self, feeds: List[FeedConfig], cutoff: float) -> List[FeedResult]:
+        """Normalize the content hubs pushed for subscribed feeds since the last run"""
+        websub = self._get_websub()
+        results = []
+        for config in feeds:
+            items: List[NewsEntry] = []
+            for body, headers in websub.drain(config.url):
+                try:
+                    items.extend(self._process_feed(config.url, feedparser.parse(body, response_headers=headers), cutoff) or [])
+                except Exception as feed_error:
+                    logger.error(f"Error processing pushed content for {config.url}: {str(feed_error)}")
+            results.append(FeedResult(config=config, fetched=False, items=items or None, timestamps=[], not_modified=False))
+        return results
+
+    def _subscribe_to_hubs(self, results: List[FeedResult]) -> None:
+        """Subscribe polled feeds that advertise a WebSub hub, so later runs receive them by push"""
+        websub = self._get_websub()
+        for result in results:
+            if result.hub and websub.needs_subscription(result.config.url):
+                hub, topic = result.hub
+                try:
+                    websub.subscribe(result.config.url, hub, topic)
+                except Exception as subscribe_error:
+                    logger.warning(f"Could not subscribe to {result.config.url} at {hub}, polling instead: {str(subscribe_error)}")
+
+    def _shard_settings(self) -> Dict[str, Any]:
+        """Return the settings a worker process needs to fetch a shard of feeds
+
+        Workers neither shard further nor persist schedule or health state;
+        their outcomes are merged and recorded by the parent.
+        """
+        settings = {name: getattr(self, name) for name in type(self).model_fields if name not in BaseTool.model_fields}
+        settings.update(process_workers=0, registry_path=None, schedule_state_path=None, health_state_path=None, websub_port=None)
+        return settings
+
+    def _collect_feeds_sharded(self, feeds: List[FeedConfig], cutoff: float) -> List[FeedResult]:
+        """Fetch and normalize feeds across a pool of worker processes
+
+        Feeds are dealt round-robin into one shard per worker so parsing and
+        normalization run in parallel. Results come back in feed order and
+        worker health outcomes are recorded in this process.
+        """
+        workers = min(self.process_workers, len(feeds))
+        shards = [feeds[i::workers] for i in range(workers)]
+        settings = self._shard_settings()
+        by_url: Dict[str, FeedResult] = {}
+
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = {pool.submit(_fetch_shard, settings, shard, cutoff): shard for shard in shards}
+        try:
+            for future in as_completed(futures, timeout=self.fetch_deadline + SHARD_DEADLINE_MARGIN):
+                try:
+                    for result in future.result():
+                        by_url[result.config.url] = result
+                except Exception as shard_error:
+                    logger.error(f"Worker process failed for {len(futures[future])} feeds: {str(shard_error)}")
+        except FuturesTimeoutError:
+            missing = sum(len(shard) for future, shard in futures.items() if not future.done())
+            logger.warning(f"Worker processes missed the fetch deadline, skipping {missing} feeds")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        health = self._get_health_tracker()
+        results = []
+        for config in feeds:
+            result = by_url.get(config.url)
+            if result is None:
+                result = FeedResult(config=config, fetched=False, items=None, timestamps=[], not_modified=False)
+            elif result.health is not None:
+                record = result.health
+                if record.consecutive_failures:
+                    health.record_failure(config.url, record.last_error or "Unknown error", record.last_latency)
+                elif record.last_success is not None:
+                    health.record_success(config.url, record.last_latency or 0.0)
+            results.append(result)
+        return results
+
+    def fetch_entries(self) -> List[NewsEntry]:
+        """Fetch, filter, deduplicate and rank news entries from all configured feeds"""
+        configs = self._feed_configs()
+        scheduler = self._get_scheduler()
+        health = self._get_health_tracker()
+        websub = self._get_websub()
+        # Feeds with an active push subscription are not polled; polling resumes when it lapses
+        pushed = [config for config in configs if config.enabled and websub.is_active(config.url)] if websub else []
+        feeds = [config for config in scheduler.due_feeds(configs) if config not in pushed]
+        skipped = [config.url for config in feeds if not health.allow_request(config.url)]
+        if skipped:
+            logger.info(f"Skipping {len(skipped)} feeds with an open circuit: {', '.join(skipped)}")
+            feeds = [config for config in feeds if config.url not in skipped]
+        logger.info(f"Configured {len(configs)} RSS feeds, {len(pushed)} pushed, {len(feeds)} due, fetching with up to {self.max_workers} workers")
+
+        collected_items: List[NewsEntry] = []
+        polled = []
+        # One cutoff for the whole run, so every feed is judged against the same window
+        cutoff = recency_cutoff(self.recency_hours)
+
+        if self.process_workers > 1 and len(feeds) > 1:
+            results = self._collect_feeds_sharded(feeds, cutoff)
+        else:
+            results = self._collect_feeds(feeds, cutoff)
+        if websub:
+            self._subscribe_to_hubs(results)
+            results += self._collect_pushed(pushed, cutoff)
+
+        for result in results:
+            if result.fetched:
+                polled.append(result.config.url)
+                if self.adaptive_polling:
+                    interval = scheduler.learn(result.config, result.timestamps, not_modified=result.not_modified)
+                    logger.debug(f"Next poll of {result.config.url} in {interval:.0f} seconds")
+            if result.items:
+                collected_items.extend(result.items)
+
+        logger.info(f"Polled {len(polled)}/{len(feeds)} due feeds successfully")
+        scheduler.mark_polled(polled)
+        health.save()
+        items = self._collapse_duplicates(collected_items)
+        if self.summary_sentences:
+            # Condense before selection so the token budget sees the shorter summaries
+            items = self._condense_entries(items)
+        selected = self._select_entries(items, {config.url: config for config in feeds + pushed})
+        if self.extract_articles and selected:
+            selected = self._attach_articles(selected)
+            if self.summary_sentences:
+                selected = self._condense_entries(selected)
+            selected = self._fit_articles(selected)
+        return selected
+
+    def mark_processed(self, entries: Optional[List[NewsEntry]] = None) -> None:
+        """Record entries as handled, so later runs skip them for `seen_ttl_hours`
+
+        Call this once the entries were published. Defaults to the selection
+        returned by the last `_run`, which is then fetched afresh next time.
+        """
+        if entries is None:
+            entries = self._pending or []
+        self._pending = None
+        seen_index = self._get_seen_index()
+        if seen_index:
+            seen_index.add(key for item in entries for key in (item.guid, item.link, *item.related_links) if key)
+            logger.info(f"Marked {len(entries)} news items as processed")
+
     def _run(self, argument: str) -> str:
         logger.info("Starting RSS News Fetcher Tool execution")
         start_time = time.time()
         
         try:
-            feeds = [
-                'https://techcrunch.com/feed/',
-                'https://www.theverge.com/rss/index.xml',
-                'https://www.wired.com/feed/rss'
-            ]
-            logger.info(f"Configured to fetch from {len(feeds)} RSS feeds")
-            
-            collected_news = []
-            successful_feeds = 0
-            
-            for url in feeds:
-                try:
-                    logger.info(f"Attempting to fetch feed: {url}")
-                    feed = feedparser.parse(url)
-                    
-                    if feed.bozo:  # feedparser sets this flag for malformed feeds
-                        logger.warning(f"Feed may be malformed: {url}, Error: {feed.bozo_exception}")
-                        continue
-                    
-                    if not feed.entries:
-                        logger.warning(f"No entries found in feed: {url}")
-                        continue
-                    
-                    # Filter for recent entries and get the top 3
-                    recent_entries = [e for e in feed.entries if self._is_recent(e)][:3]
-                    
-                    logger.info(f"Successfully fetched {len(recent_entries)} recent entries from {url}")
-                    for entry in recent_entries:
-                        title = entry.get("title", "No title")
-                        link = entry.get("link", "No link")
-                        summary = self._get_entry_summary(entry)
-                        
-                        collected_news.append(f"Title: {title}\nLink: {link}\nSummary: {summary}\n")
-                    successful_feeds += 1
-                    
-                except Exception as feed_error:
-                    logger.error(f"Error processing feed {url}: {str(feed_error)}")
-                    continue
+            # Repeat calls before the selection is marked processed return the same items
+            if not self._pending:
+                self._pending = self.fetch_entries()
+            entries = self._pending
 
             execution_time = time.time() - start_time
-            logger.info(f"News fetching completed. Processed {successful_feeds}/{len(feeds)} feeds successfully in {execution_time:.2f} seconds")
+            logger.info(f"News fetching completed with {len(entries)} items in {execution_time:.2f} seconds")
             
-            if not collected_news:
+            if not entries:
                 logger.warning("No news items were collected from any feed")
                 return "No news items could be fetched at this time."
                 
-            return "\n---\n".join(collected_news)
+            if self.group_topics:
+                groups = group_by_topic(entries, self.topic_similarity)
+                logger.info(f"Grouped {len(entries)} news items into {len(groups)} themes")
+                if self.output_format == "json":
+                    return render_groups_json(groups)
+                return render_groups_text(groups)
+            if self.output_format == "json":
+                return render_json(entries)
+            return render_text(entries)
             
         except Exception as e:
             execution_time = time.time() - start_time
             logger.exception(f"Critical error in news fetcher after {execution_time:.2f} seconds")
             return f"Error fetching news: {str(e)}"
+
+
+def _fetch_shard(settings: Dict[str, Any], feeds: List[FeedConfig], cutoff: float) -> List[FeedResult]:
+    """Worker process entry point: fetch and normalize one shard of feeds"""
+    tool = RSSNewsFetcherTool(**settings)
+    health = tool._get_health_tracker()
+    return [
+        result._replace(health=health.records.get(result.config.url))
+        for result in tool._collect_feeds(feeds, cutoff)
+    ]
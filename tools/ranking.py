@@ -0,0 +1,49 @@
+import math
+from collections import Counter
+from typing import List, Sequence
+
+from tools.text import tokenize
+
+DEFAULT_TOPIC_QUERY = (
+    "ai artificial intelligence machine learning ml llm model openai "
+    "cybersecurity security vulnerability breach ransomware hack "
+    "software developer open source cloud release update launch announces"
+)
+
+
+class BM25Scorer:
+    """Okapi BM25 relevance scorer for a fixed topic query
+
+    Document frequencies are computed over the documents passed to `score`,
+    so each run is scored against its own candidate set.
+    """
+
+    def __init__(self, query: str, k1: float = 1.5, b: float = 0.75):
+        self.terms = list(dict.fromkeys(tokenize(query)))
+        self.k1 = k1
+        self.b = b
+
+    def score(self, documents: Sequence[str]) -> List[float]:
+        """Return a BM25 score for each document"""
+        docs = [Counter(tokenize(doc)) for doc in documents]
+        lengths = [sum(doc.values()) for doc in docs]
+        if not docs or not self.terms:
+            return [0.0] * len(docs)
+
+        avg_length = (sum(lengths) / len(docs)) or 1.0
+        count = len(docs)
+        idf = {}
+        for term in self.terms:
+            df = sum(1 for doc in docs if term in doc)
+            idf[term] = math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+        scores = []
+        for doc, length in zip(docs, lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+            total = 0.0
+            for term in self.terms:
+                tf = doc.get(term, 0)
+                if tf:
+                    total += idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(total)
+        return scores
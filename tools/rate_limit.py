@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from logger import setup_logger
+
+logger = setup_logger()
+
+# Longest pause a server can ask for, so a bogus Retry-After can't stall publishing for hours
+MAX_RETRY_AFTER = 300.0
+# A throttled bucket drops to this share of its rate (down to a sixteenth of the configured
+# rate) and recovers by RATE_RECOVERY of the configured rate per successful request
+BACKOFF_FACTOR = 0.5
+RATE_RECOVERY = 0.1
+THROTTLE_STATUSES = frozenset({429, 503})
+
+_limiter: Optional["RateLimiter"] = None
+_limiter_lock = threading.Lock()
+
+
+def _reset_limiters_after_fork() -> None:
+    global _limiter, _limiter_lock
+    _limiter = None
+    _limiter_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_limiters_after_fork)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Return the seconds a Retry-After header (delta-seconds or HTTP date) asks to wait, or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return min(max(0.0, (retry_at - now).total_seconds()), MAX_RETRY_AFTER)
+
+
+def _check_settings(rate: float, capacity: float) -> None:
+    if rate <= 0:
+        raise ValueError("Rate must be positive")
+    if capacity < 1:
+        raise ValueError("Bucket capacity must be at least 1")
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second in bursts of `capacity`
+
+    Callers reserve a token and sleep off any deficit outside the lock, so
+    waiting threads are served in order without busy-waiting. `penalize`
+    pauses the bucket and lowers its rate; `reward` restores it gradually.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        _check_settings(rate, capacity)
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()  # Ahead of the clock while the bucket is paused
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def configure(self, rate: float, capacity: float) -> None:
+        """Change the configured rate and burst, keeping any backoff in proportion"""
+        _check_settings(rate, capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate * self.rate / self.max_rate
+            self.max_rate = rate
+            self.capacity = capacity
+            self._tokens = min(self._tokens, float(capacity))
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            return max(0.0, self._updated - now) + max(0.0, -self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a request may be sent and return the seconds waited"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, retry_after: Optional[float] = None) -> float:
+        """Slow down after a throttled request; returns the seconds until the next request may go out"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.max_rate / 16, self.rate * BACKOFF_FACTOR)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            # Requests already queued keep their place behind the pause
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + pause)
+            return self._updated - now + max(0.0, -self._tokens) / self.rate
+
+    def reward(self) -> None:
+        """Move the rate back towards the configured rate after a successful request"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_RECOVERY)
+
+
+class RateLimiter:
+    """Token buckets per endpoint, shared by all threads using the limiter
+
+    Buckets start with the limiter's `rate` and `burst`. Callers that pass
+    their own settings reconfigure the endpoint's bucket instead of getting
+    a separate one, so every caller is paced by the same bucket and the
+    latest settings apply.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint: str, rate: Optional[float] = None, burst: Optional[float] = None) -> TokenBucket:
+        """Return the bucket of `endpoint`, configured with `rate` and `burst` if given"""
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                bucket = self._buckets[endpoint] = TokenBucket(rate or self.rate, burst or self.burst)
+        if (rate and rate != bucket.max_rate) or (burst and burst != bucket.capacity):
+            bucket.configure(rate or bucket.max_rate, burst or bucket.capacity)
+        return bucket
+
+    def acquire(self, endpoint: str, rate: Optional[float] = None, burst: Optional[float] = None) -> float:
+        """Block until a request to `endpoint` may be sent and return the seconds waited"""
+        waited = self.bucket(endpoint, rate, burst).acquire()
+        if waited > 0:
+            logger.debug(f"Rate limiting: waited {waited:.2f} seconds for {endpoint}")
+        return waited
+
+    def update(self, endpoint: str, response: Any) -> Optional[float]:
+        """Adapt to a response from `endpoint`
+
+        Returns the seconds until the next request may go out if the server
+        throttled the request (HTTP 429/503), otherwise None.
+        """
+        bucket = self.bucket(endpoint)
+        if response.status_code not in THROTTLE_STATUSES:
+            bucket.reward()
+            return None
+        delay = bucket.penalize(parse_retry_after(response.headers.get("Retry-After")))
+        logger.warning(f"{endpoint} throttled requests (HTTP {response.status_code}), slowing down to {bucket.rate:.2f} requests per second")
+        return delay
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter, whose buckets every caller shares per endpoint"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
@@ -0,0 +1,47 @@
+import calendar
+import time
+from typing import Any, Dict, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T", bound=Dict[str, Any])
+
+
+def recency_cutoff(window_hours: float, now: Optional[float] = None) -> float:
+    """Return the epoch-seconds cutoff for entries published within `window_hours`"""
+    now = time.time() if now is None else now
+    return now - window_hours * 3600
+
+
+def entry_timestamp(entry: Dict[str, Any]) -> Optional[float]:
+    """Return an entry's publish (or update) time as UTC epoch seconds
+
+    feedparser normalizes dates to UTC struct_times, so they are converted
+    with calendar.timegm rather than the local-time time.mktime.
+    """
+    published = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not published:
+        return None
+    try:
+        return float(calendar.timegm(published))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def filter_recent(entries: Sequence[T], cutoff: float) -> List[T]:
+    """Keep entries published at or after `cutoff` in a single pass
+
+    Entries without a usable date are kept, matching the per-entry check.
+    """
+    timegm = calendar.timegm
+    recent = []
+    append = recent.append
+    for entry in entries:
+        published = entry.get('published_parsed') or entry.get('updated_parsed')
+        if not published:
+            append(entry)
+            continue
+        try:
+            if timegm(published) >= cutoff:
+                append(entry)
+        except (TypeError, ValueError, OverflowError):
+            append(entry)
+    return recent
@@ -0,0 +1,128 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from logger import setup_logger
+
+logger = setup_logger()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter used for fast negative lookups
+
+    A miss is definitive; a hit only means the key may be present and must be
+    confirmed against the backing store.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("Bloom filter capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1")
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenIndex:
+    """SQLite-backed index of article links/GUIDs handled by earlier runs
+
+    Keys older than `ttl_seconds` are evicted when the index is opened and
+    are never reported as seen.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 72 * 3600, use_bloom: bool = True, bloom_capacity: int = 100_000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_at_idx ON seen (seen_at)")
+        self._conn.commit()
+
+        evicted = self.evict_expired()
+        if evicted:
+            logger.info(f"Evicted {evicted} expired entries from seen index")
+
+        self._bloom: Optional[BloomFilter] = None
+        if use_bloom:
+            self._bloom = BloomFilter(capacity=bloom_capacity)
+            for (key,) in self._conn.execute("SELECT key FROM seen"):
+                self._bloom.add(key)
+
+    @staticmethod
+    def entry_keys(entry: Dict[str, Any]) -> List[str]:
+        """Return the identifying keys (GUID and link) of a feed entry"""
+        keys = []
+        for field in ('id', 'link'):
+            value = entry.get(field)
+            if value and value not in keys:
+                keys.append(value)
+        return keys
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl_seconds
+
+    def evict_expired(self) -> int:
+        """Delete keys older than the TTL and return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM seen WHERE seen_at < ?", (self._cutoff(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def contains(self, key: str) -> bool:
+        """Check whether a key was seen within the TTL"""
+        if self._bloom is not None and key not in self._bloom:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM seen WHERE key = ? AND seen_at >= ?", (key, self._cutoff())
+            ).fetchone()
+        return row is not None
+
+    def is_seen(self, entry: Dict[str, Any]) -> bool:
+        """Check whether any key of a feed entry was seen within the TTL"""
+        return any(self.contains(key) for key in self.entry_keys(entry))
+
+    def add(self, keys: Iterable[str]) -> None:
+        """Mark keys as seen now"""
+        now = time.time()
+        rows = [(key, now) for key in keys]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO seen (key, seen_at) VALUES (?, ?)", rows)
+            self._conn.commit()
+        if self._bloom is not None:
+            for key, _ in rows:
+                self._bloom.add(key)
+
+    def mark_seen(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Mark all keys of the given feed entries as seen"""
+        self.add(key for entry in entries for key in self.entry_keys(entry))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,129 @@
+import calendar
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+import feedparser
+from logger import setup_logger
+
+logger = setup_logger()
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+RSS1_NS = "{http://purl.org/rss/1.0/}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+_ENTRY_TAGS = frozenset({"item", f"{RSS1_NS}item", f"{ATOM_NS}entry"})
+# Feeds are newest-first, but tolerate a few out-of-order entries before giving up
+OLD_ENTRY_TOLERANCE = 3
+
+
+def _parse_date(value: Optional[str]) -> Optional[time.struct_time]:
+    """Parse an RFC 822 or ISO 8601 date into a UTC struct_time"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).utctimetuple()
+
+
+def _text(element: Optional[Element]) -> Optional[str]:
+    if element is None:
+        return None
+    if element.get("type") == "xhtml":
+        return "".join(element.itertext()).strip()
+    return (element.text or "").strip()
+
+
+def _atom_link(element: Element) -> Optional[str]:
+    for link in element.findall(f"{ATOM_NS}link"):
+        if link.get("rel", "alternate") == "alternate":
+            return link.get("href")
+    return None
+
+
+def _entry_from_element(element: Element) -> feedparser.FeedParserDict:
+    """Map an RSS item or Atom entry element to a feedparser-style entry"""
+    if element.tag == f"{ATOM_NS}entry":
+        ns = ATOM_NS
+        link = _atom_link(element)
+        guid = _text(element.find(f"{ns}id"))
+        summary = _text(element.find(f"{ns}summary"))
+        content = _text(element.find(f"{ns}content"))
+        published = _text(element.find(f"{ns}published"))
+        updated = _text(element.find(f"{ns}updated"))
+    else:
+        ns = RSS1_NS if element.tag.startswith(RSS1_NS) else ""
+        link = _text(element.find(f"{ns}link"))
+        guid = _text(element.find("guid")) or element.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about")
+        summary = _text(element.find(f"{ns}description"))
+        content = _text(element.find(f"{CONTENT_NS}encoded"))
+        published = _text(element.find("pubDate")) or _text(element.find(f"{DC_NS}date"))
+        updated = None
+
+    entry = feedparser.FeedParserDict()
+    entry["title"] = _text(element.find(f"{ns}title")) or ""
+    if link:
+        entry["link"] = link
+    if guid:
+        entry["id"] = guid
+    if summary:
+        entry["summary"] = summary
+    if content:
+        entry["content"] = [feedparser.FeedParserDict(value=content)]
+    published_parsed = _parse_date(published)
+    updated_parsed = _parse_date(updated)
+    if published_parsed:
+        entry["published_parsed"] = published_parsed
+    if updated_parsed:
+        entry["updated_parsed"] = updated_parsed
+    return entry
+
+
+def parse_stream(chunks: Iterable[bytes], max_entries: int, cutoff: Optional[float] = None) -> feedparser.FeedParserDict:
+    """Incrementally parse an RSS/Atom document, stopping as early as possible
+
+    Reading stops once `max_entries` recent entries were collected or, when
+    `cutoff` (epoch seconds) is given, once entries fall past it. Each entry
+    element is discarded after conversion, so memory stays bounded by the
+    number of collected entries, not the size of the document.
+    """
+    parser = XMLPullParser(events=("end",))
+    entries = []
+    consecutive_old = 0
+    result = feedparser.FeedParserDict(bozo=False, entries=entries, feed=feedparser.FeedParserDict())
+
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if element.tag not in _ENTRY_TAGS:
+                    continue
+                entry = _entry_from_element(element)
+                element.clear()
+
+                published = entry.get("published_parsed") or entry.get("updated_parsed")
+                if cutoff is not None and published and calendar.timegm(published) < cutoff:
+                    consecutive_old += 1
+                    if consecutive_old >= OLD_ENTRY_TOLERANCE:
+                        return result
+                    continue
+                consecutive_old = 0
+                entries.append(entry)
+                if len(entries) >= max_entries:
+                    return result
+        parser.close()
+    except ParseError as e:
+        result["bozo"] = True
+        result["bozo_exception"] = e
+    return result
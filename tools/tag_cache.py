@@ -0,0 +1,109 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, Optional
+
+from logger import setup_logger
+
+logger = setup_logger()
+
+
+def tag_slug(name: str) -> str:
+    """Normalize a tag name the way WordPress derives slugs ("Machine Learning" -> "machine-learning")"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    text = "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    text = re.sub(r"[^\w\s-]", "", text)
+    return re.sub(r"[\s-]+", "-", text).strip("-")
+
+
+class TagCache:
+    """SQLite-backed cache of WordPress tag IDs, keyed by site and tag slug
+
+    Entries older than `ttl_seconds` are evicted when the cache is opened and
+    are never returned. IDs the site rejects should be dropped with
+    `invalidate` so they are looked up again.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 7 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tags (site TEXT NOT NULL, slug TEXT NOT NULL, tag_id INTEGER NOT NULL, "
+            "cached_at REAL NOT NULL, PRIMARY KEY (site, slug))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS warmups (site TEXT PRIMARY KEY, warmed_at REAL NOT NULL)")
+        self._conn.commit()
+
+        evicted = self.evict_expired()
+        if evicted:
+            logger.info(f"Evicted {evicted} expired entries from tag cache")
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl_seconds
+
+    def evict_expired(self) -> int:
+        """Delete entries older than the TTL and return how many tags were removed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM tags WHERE cached_at < ?", (self._cutoff(),))
+            self._conn.execute("DELETE FROM warmups WHERE warmed_at < ?", (self._cutoff(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def get(self, site: str, name: str) -> Optional[int]:
+        """Return the cached ID of a tag, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tag_id FROM tags WHERE site = ? AND slug = ? AND cached_at >= ?", (site, tag_slug(name), self._cutoff())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_many(self, site: str, tag_ids: Dict[str, int]) -> None:
+        """Cache IDs for the given tag names (or slugs)"""
+        now = time.time()
+        rows = [(site, tag_slug(name), tag_id, now) for name, tag_id in tag_ids.items()]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO tags (site, slug, tag_id, cached_at) VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def set(self, site: str, name: str, tag_id: int) -> None:
+        self.set_many(site, {name: tag_id})
+
+    def invalidate(self, site: str, tag_ids: Iterable[int]) -> int:
+        """Drop cached entries pointing at the given IDs and return how many were removed"""
+        rows = [(site, tag_id) for tag_id in tag_ids]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM tags WHERE site = ? AND tag_id = ?", rows)
+            removed = self._conn.total_changes - before
+            # Any ID can go stale, so a warm-up no longer means the cache is complete
+            self._conn.execute("DELETE FROM warmups WHERE site = ?", (site,))
+            self._conn.commit()
+            return removed
+
+    def is_warm(self, site: str) -> bool:
+        """Check whether all tags of a site were loaded within the TTL"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM warmups WHERE site = ? AND warmed_at >= ?", (site, self._cutoff())
+            ).fetchone()
+        return row is not None
+
+    def mark_warm(self, site: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO warmups (site, warmed_at) VALUES (?, ?)", (site, time.time()))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
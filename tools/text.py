@@ -0,0 +1,14 @@
+import re
+from typing import List
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in into is it its of on or says that the their this
+to was were will with after about new over how why what who you your just now more than can could
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, dropping stopwords"""
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
@@ -0,0 +1,41 @@
+import math
+import re
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+# Calibrated against the Llama/Mistral SentencePiece tokenizers on English
+# news text, which average roughly 3.6 characters per token
+CHARS_PER_TOKEN = 3.6
+
+
+def estimate_tokens(text: str, chars_per_token: float = CHARS_PER_TOKEN) -> int:
+    """Estimate the number of LLM tokens in a text without a tokenizer
+
+    Takes the larger of the character-based estimate and the number of
+    word/punctuation pieces, so URLs and symbol-heavy text are not
+    undercounted. Errs on the high side, which is what a budget needs.
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / chars_per_token), len(_PIECE_RE.findall(text)))
+
+
+class TokenBudget:
+    """Running token budget for packing items into a prompt"""
+
+    def __init__(self, limit: int):
+        if limit <= 0:
+            raise ValueError("Token budget must be positive")
+        self.limit = limit
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.limit - self.used
+
+    def try_spend(self, tokens: int) -> bool:
+        """Spend `tokens` if they fit in the remaining budget"""
+        if tokens > self.remaining:
+            return False
+        self.used += tokens
+        return True
@@ -0,0 +1,113 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from tools.news_entry import NewsEntry
+from tools.text import tokenize
+
+THEME_LABEL_TERMS = 3
+
+
+@dataclass(frozen=True)
+class TopicGroup:
+    """Related news entries grouped into one theme"""
+    label: Tuple[str, ...]  # Most characteristic terms of the theme
+    headline: str  # Title of the entry closest to the theme centroid
+    entries: Tuple[NewsEntry, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"theme": list(self.label), "headline": self.headline, "items": [entry.to_dict() for entry in self.entries]}
+
+    def render_text(self) -> str:
+        """Render the group as a theme header followed by its entries"""
+        count = len(self.entries)
+        header = f"Theme: {', '.join(self.label)} ({count} {'story' if count == 1 else 'stories'})\nKey headline: {self.headline}\n\n"
+        return header + "\n---\n".join(entry.render_text() for entry in self.entries)
+
+
+def tfidf_vectors(documents: Sequence[Sequence[str]]) -> Tuple[np.ndarray, List[str]]:
+    """Return L2-normalized TF-IDF rows (sublinear tf, smoothed idf) and the vocabulary"""
+    vocabulary = sorted({token for document in documents for token in document})
+    columns = {token: i for i, token in enumerate(vocabulary)}
+    counts = np.zeros((len(documents), len(vocabulary)))
+    for row, document in enumerate(documents):
+        for token in document:
+            counts[row, columns[token]] += 1
+
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    vectors = np.log1p(counts) * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms, vocabulary
+
+
+def agglomerative_clusters(vectors: np.ndarray, threshold: float) -> List[List[int]]:
+    """Average-linkage agglomerative clustering on cosine similarity
+
+    The two clusters with the highest average pairwise similarity are merged
+    until none reaches `threshold`. Returns lists of row indices, each sorted
+    ascending and ordered by their first index.
+    """
+    count = len(vectors)
+    if count == 0:
+        return []
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, -np.inf)
+    sizes = np.ones(count)
+    members: Dict[int, List[int]] = {i: [i] for i in range(count)}
+
+    while len(members) > 1:
+        flat = int(np.argmax(similarity))
+        i, j = divmod(flat, count)
+        if similarity[i, j] < threshold:
+            break
+        keep, drop = min(i, j), max(i, j)
+        # Lance-Williams update for average linkage
+        merged = (sizes[keep] * similarity[keep] + sizes[drop] * similarity[drop]) / (sizes[keep] + sizes[drop])
+        similarity[keep, :] = merged
+        similarity[:, keep] = merged
+        similarity[keep, keep] = -np.inf
+        similarity[drop, :] = -np.inf
+        similarity[:, drop] = -np.inf
+        sizes[keep] += sizes[drop]
+        members[keep] = sorted(members[keep] + members.pop(drop))
+
+    return sorted(members.values(), key=lambda group: group[0])
+
+
+def group_by_topic(entries: Sequence[NewsEntry], threshold: float = 0.2) -> List[TopicGroup]:
+    """Cluster entries into themes, keeping the order of the input
+
+    Themes are ordered by their best-placed entry and entries keep their
+    relative order, so ranked input stays ranked. Each theme is labelled
+    with the top TF-IDF terms of its centroid.
+    """
+    if not entries:
+        return []
+    vectors, vocabulary = tfidf_vectors([tokenize(f"{entry.title} {entry.title} {entry.summary}") for entry in entries])
+
+    groups = []
+    for cluster in agglomerative_clusters(vectors, threshold):
+        centroid = vectors[cluster].mean(axis=0)
+        representative = cluster[int(np.argmax(vectors[cluster] @ centroid))]
+        # Bare numbers ("5" from "GPT-5") make poor labels
+        terms = [vocabulary[i] for i in np.argsort(-centroid, kind="stable") if centroid[i] > 0 and not vocabulary[i].isdigit()]
+        groups.append(TopicGroup(
+            label=tuple(terms[:THEME_LABEL_TERMS]),
+            headline=entries[representative].title,
+            entries=tuple(entries[i] for i in cluster),
+        ))
+    return groups
+
+
+def render_groups_text(groups: Iterable[TopicGroup]) -> str:
+    """Render themes separated by `===` lines"""
+    return "\n===\n".join(group.render_text() for group in groups)
+
+
+def render_groups_json(groups: Iterable[TopicGroup]) -> str:
+    """Render themes as a compact JSON array"""
+    return json.dumps([group.to_dict() for group in groups], ensure_ascii=False, separators=(",", ":"))
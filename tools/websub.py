@@ -0,0 +1,234 @@
+import hmac
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from logger import setup_logger
+from tools.http_client import get_shared_session
+
+logger = setup_logger()
+
+# Subscriptions count as expired this long before their lease ends (at most a tenth of
+# the lease), so polling takes over before pushes stop
+LEASE_RENEWAL_MARGIN = 3600.0
+# A subscription request that was never verified (or was denied) is retried after this long
+PENDING_RETRY_SECONDS = 3600.0
+# Pushes kept per feed until the next fetch drains them
+MAX_QUEUED_PUSHES = 20
+MAX_PUSH_BYTES = 5_000_000
+_SIGNATURE_ALGORITHMS = frozenset({"sha1", "sha256", "sha384", "sha512"})
+
+
+def discover_hub(feed: Any) -> Optional[Tuple[str, Optional[str]]]:
+    """Return the (hub, self URL) a parsed feed advertises for WebSub, if any"""
+    links = feed.get("feed", {}).get("links", []) if hasattr(feed, "get") else []
+    hub = next((link.get("href") for link in links if link.get("rel") == "hub" and link.get("href")), None)
+    if not hub:
+        return None
+    topic = next((link.get("href") for link in links if link.get("rel") == "self" and link.get("href")), None)
+    return hub, topic
+
+
+@dataclass
+class Subscription:
+    """A feed's WebSub subscription and the content pushed for it"""
+    feed_url: str
+    topic: str
+    hub: str
+    token: str  # Last path segment of the feed's callback URL, random per subscription request
+    state: str = "pending"  # pending, active, denied
+    requested_at: float = 0.0
+    verifying: bool = False  # The hub may verify the request only while this is set
+    renew_at: Optional[float] = None  # Polling resumes from this time unless the lease is renewed
+    pushes: List[Tuple[bytes, Dict[str, str]]] = field(default_factory=list)
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    """Answers hub verification requests (GET) and content distribution (POST)"""
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        challenge = self.server.subscriber._verify(parts.path.rsplit("/", 1)[-1], params)
+        if challenge is None:
+            self._reply(404)
+        else:
+            self._reply(200, challenge.encode("utf-8"))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_PUSH_BYTES:
+            self._reply(413)
+            return
+        body = self.rfile.read(length)
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        self._reply(self.server.subscriber._receive(urlsplit(self.path).path.rsplit("/", 1)[-1], body, headers))
+
+    def _reply(self, status: int, body: bytes = b"") -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"WebSub callback: {format % args}")
+
+
+class WebSubSubscriber:
+    """WebSub (PubSubHubbub) subscriber with a local HTTP callback endpoint
+
+    Feeds are subscribed at the hub they advertise. The hub verifies the
+    intent with a GET to the callback, then POSTs new feed content, which is
+    queued per feed until drained. Each request gets an unguessable callback
+    token, and verifications are only accepted for a request still awaiting
+    one, with the lease capped at `lease_seconds`. With a `secret`, pushes
+    must carry a matching X-Hub-Signature HMAC and are ignored otherwise. A subscription
+    only counts as active until shortly before its lease ends, so callers
+    fall back to polling (and resubscribe) instead of missing updates.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, callback_url: Optional[str] = None, secret: Optional[str] = None,
+                 lease_seconds: float = 86400.0, timeout: float = 10.0):
+        self.secret = secret
+        self.lease_seconds = lease_seconds
+        self.timeout = timeout
+        self.subscriptions: Dict[str, Subscription] = {}
+        self._by_token: Dict[str, Subscription] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _CallbackHandler)
+        self._server.daemon_threads = True
+        self._server.subscriber = self
+        self.callback_url = (callback_url or f"http://{host}:{self._server.server_address[1]}").rstrip("/")
+        self._thread = threading.Thread(target=self._server.serve_forever, name="websub-callback", daemon=True)
+        self._thread.start()
+        logger.info(f"WebSub callback endpoint listening on {host}:{self._server.server_address[1]}")
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def stop(self) -> None:
+        """Shut the callback endpoint down"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def subscribe(self, feed_url: str, hub: str, topic: Optional[str] = None) -> None:
+        """Ask `hub` to push updates of a feed; the subscription activates once the hub verifies it"""
+        topic = topic or feed_url
+        token = secrets.token_urlsafe(32)
+        subscription = Subscription(feed_url=feed_url, topic=topic, hub=hub, token=token, requested_at=time.time(), verifying=True)
+        with self._lock:
+            previous = self.subscriptions.get(feed_url)
+            if previous:
+                previous.verifying = False
+            if previous and previous.state == "active":
+                # Renewal: keep serving pushes until the new lease is verified
+                subscription.state, subscription.renew_at, subscription.pushes = previous.state, previous.renew_at, previous.pushes
+                self._by_token[previous.token] = subscription
+            self.subscriptions[feed_url] = subscription
+            self._by_token[token] = subscription
+
+        data = {
+            "hub.mode": "subscribe",
+            "hub.topic": topic,
+            "hub.callback": f"{self.callback_url}/{token}",
+            "hub.lease_seconds": str(int(self.lease_seconds)),
+        }
+        if self.secret:
+            data["hub.secret"] = self.secret
+        # Registered before the request, since hubs may verify before answering
+        try:
+            response = get_shared_session().post(hub, data=data, timeout=self.timeout)
+            if not 200 <= response.status_code < 300:
+                raise requests.HTTPError(f"Hub {hub} rejected subscription to {topic}: HTTP {response.status_code}")
+        except Exception:
+            with self._lock:
+                subscription.verifying = False
+            raise
+        logger.info(f"Requested WebSub subscription to {topic} at {hub}")
+
+    def needs_subscription(self, feed_url: str, now: Optional[float] = None) -> bool:
+        """Check whether a feed has no usable subscription and none was requested recently"""
+        now = time.time() if now is None else now
+        subscription = self.subscriptions.get(feed_url)
+        if subscription is None:
+            return True
+        if subscription.state == "active":
+            return not self.is_active(feed_url, now)
+        return now - subscription.requested_at >= PENDING_RETRY_SECONDS
+
+    def is_active(self, feed_url: str, now: Optional[float] = None) -> bool:
+        """Check whether updates of a feed currently arrive by push, so it need not be polled"""
+        subscription = self.subscriptions.get(feed_url)
+        if subscription is None or subscription.state != "active" or subscription.renew_at is None:
+            return False
+        now = time.time() if now is None else now
+        return now < subscription.renew_at
+
+    def drain(self, feed_url: str) -> List[Tuple[bytes, Dict[str, str]]]:
+        """Return and clear the (body, headers) pushes received for a feed"""
+        with self._lock:
+            subscription = self.subscriptions.get(feed_url)
+            if subscription is None:
+                return []
+            pushes, subscription.pushes = subscription.pushes, []
+        return pushes
+
+    def _verify(self, token: str, params: Dict[str, str]) -> Optional[str]:
+        """Handle a hub's verification of intent; returns the challenge to echo, or None to refuse
+
+        Only the latest request for a feed can be verified, and only until it
+        is answered or `PENDING_RETRY_SECONDS` have passed, so nobody can
+        activate a subscription the hub never agreed to.
+        """
+        mode = params.get("hub.mode")
+        with self._lock:
+            subscription = self._by_token.get(token)
+            if subscription is None or subscription.token != token or not subscription.verifying:
+                return None
+            if params.get("hub.topic") != subscription.topic or time.time() - subscription.requested_at >= PENDING_RETRY_SECONDS:
+                return None
+            if mode == "denied":
+                subscription.state, subscription.verifying = "denied", False
+                logger.warning(f"Hub denied WebSub subscription to {subscription.topic}: {params.get('hub.reason', 'no reason given')}")
+                return ""
+            if mode != "subscribe":
+                return None
+            try:
+                lease = float(params.get("hub.lease_seconds") or self.lease_seconds)
+            except ValueError:
+                lease = self.lease_seconds
+            if not 0 < lease <= self.lease_seconds:
+                lease = self.lease_seconds
+            subscription.state, subscription.verifying = "active", False
+            subscription.renew_at = time.time() + lease - min(LEASE_RENEWAL_MARGIN, lease / 10)
+            # Callbacks of earlier requests for this feed stop receiving pushes
+            for stale in [key for key, value in self._by_token.items() if value is subscription and key != token]:
+                del self._by_token[stale]
+        logger.info(f"WebSub subscription to {subscription.topic} verified for {lease:.0f} seconds")
+        return params.get("hub.challenge", "")
+
+    def _receive(self, token: str, body: bytes, headers: Dict[str, str]) -> int:
+        """Queue pushed content for its feed and return the HTTP status to answer with"""
+        with self._lock:
+            subscription = self._by_token.get(token)
+            if subscription is None or subscription.state != "active":
+                return 410  # Tells the hub to stop pushing
+            if self.secret and not self._signature_valid(body, headers.get("x-hub-signature", "")):
+                logger.warning(f"Ignoring WebSub push with a bad signature for {subscription.topic}")
+                return 202  # Hubs must not learn whether the signature matched
+            subscription.pushes = (subscription.pushes + [(body, headers)])[-MAX_QUEUED_PUSHES:]
+        logger.info(f"Received WebSub push of {len(body)} bytes for {subscription.topic}")
+        return 202
+
+    def _signature_valid(self, body: bytes, signature: str) -> bool:
+        algorithm, _, digest = signature.partition("=")
+        if algorithm not in _SIGNATURE_ALGORITHMS:
+            return False
+        expected = hmac.new(self.secret.encode("utf-8"), body, algorithm).hexdigest()
+        return hmac.compare_digest(expected, digest)
@@ -3,27 +3,59 @@ from pydantic import Field, BaseModel
 import requests
 import os
 import json
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from dotenv import find_dotenv, load_dotenv
 from requests.auth import HTTPBasicAuth
 from logger import setup_logger
+from tools.http_client import get_shared_session
+from tools.rate_limit import RateLimiter, get_rate_limiter
+from tools.tag_cache import TagCache, tag_slug
 from typing import Dict, Any, List, Tuple, Optional
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
 
 logger = setup_logger()
 
+# Most tags resolved by one slug-filtered lookup (the REST API's per_page limit)
+TAG_LOOKUP_BATCH = 100
+
 class WordPressPostData(BaseModel):
     title: str = Field(description="The title of the blog post")
     content: str = Field(description="The full content of the blog post")
     tags: List[str] = Field(description="List of tags for the post")
     categories: List[int] = Field(description="List of category IDs for the post")
 
+@dataclass(frozen=True)
+class WordPressConfig:
+    """Credentials and REST endpoints of the WordPress site"""
+    posts_url: str
+    tags_url: str
+    categories_url: str
+    media_url: str
+    user: str
+    password: str = field(repr=False)
+
+    @property
+    def auth(self) -> HTTPBasicAuth:
+        return HTTPBasicAuth(self.user, self.password)
+
 class WordPressPosterTool(BaseTool):
     name: str = Field(default="wordpress_poster")
     description: str = Field(default="Posts content to a WordPress blog using the REST API")
     args_schema: type[BaseModel] = WordPressPostData
-    _last_request_time: float = 0
-    _min_request_interval: float = 2.0  # Minimum seconds between requests
+    pool_maxsize: int = Field(default=10, description="Keep-alive connections kept open to the WordPress host")
+    connect_timeout: float = Field(default=5.0, description="Seconds to wait for a connection to the WordPress host")
+    read_timeout: float = Field(default=30.0, description="Seconds to wait for each WordPress API response")
+    requests_per_second: float = Field(default=2.0, description="Sustained request rate per REST endpoint, shared by all tools in the process")
+    request_burst: int = Field(default=5, description="Requests per endpoint that may be sent back to back before pacing starts")
+    tag_cache_path: Optional[str] = Field(default=".cache/wordpress_tags.sqlite3", description="SQLite cache of tag IDs by slug (None disables it)")
+    tag_cache_ttl_hours: float = Field(default=24 * 7, description="Hours a cached tag ID is trusted before it is looked up again")
+    tag_cache_warmup: bool = Field(default=False, description="Load all of the site's tags into the cache before the first lookup")
     _max_retries: int = 3
+    _tag_cache: Optional[TagCache] = None
+    _config: Optional[WordPressConfig] = None
+    _dotenv_state: Tuple[str, Optional[float]] = ("", None)  # .env path and mtime the config was loaded from
 
     def _build_api_url(self, base_url: str) -> str:
         """Return a normalized WordPress posts API URL."""
@@ -43,15 +75,35 @@ class WordPressPosterTool(BaseTool):
 
         return f"{base_url}/wp-json/wp/v2/posts"
 
-    def _wait_for_rate_limit(self):
-        """Implement rate limiting between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        if time_since_last < self._min_request_interval:
-            sleep_time = self._min_request_interval - time_since_last
-            logger.debug(f"Rate limiting: waiting {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        self._last_request_time = time.time()
+    def _get_session(self) -> requests.Session:
+        """Return the process-wide pooled session, so posts reuse keep-alive connections"""
+        return get_shared_session(max_connections_per_host=self.pool_maxsize)
+
+    def _timeout(self) -> Tuple[float, float]:
+        return self.connect_timeout, self.read_timeout
+
+    def _get_tag_cache(self) -> Optional[TagCache]:
+        """Return the tag cache, opening it on first use"""
+        if not self.tag_cache_path:
+            return None
+        if self._tag_cache is None:
+            self._tag_cache = TagCache(self.tag_cache_path, ttl_seconds=self.tag_cache_ttl_hours * 3600)
+        return self._tag_cache
+
+    def _get_rate_limiter(self) -> RateLimiter:
+        return get_rate_limiter()
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a REST call paced by the endpoint's token bucket, retrying when the server throttles"""
+        limiter = self._get_rate_limiter()
+        for attempt in range(self._max_retries):
+            limiter.acquire(url, self.requests_per_second, self.request_burst)
+            response = self._get_session().request(method, url, timeout=self._timeout(), **kwargs)
+            delay = limiter.update(url, response)
+            if delay is None or attempt == self._max_retries - 1:
+                return response
+            logger.warning(f"WordPress throttled {method} {url} (HTTP {response.status_code}), retrying in {delay:.1f} seconds")
+        return response
 
     def _make_request_with_retry(self, url: str, auth: HTTPBasicAuth, headers: dict, payload: dict) -> requests.Response:
         """Make HTTP request with retry logic"""
@@ -59,16 +111,14 @@ class WordPressPosterTool(BaseTool):
         
         for attempt in range(self._max_retries):
             try:
-                self._wait_for_rate_limit()
-                response = requests.post(
+                return self._send(
+                    "POST",
                     url,
                     auth=auth,
                     headers=headers,
                     json=payload,
-                    verify=True,
-                    timeout=30
+                    verify=True
                 )
-                return response
             except (requests.ConnectionError, requests.Timeout) as e:
                 last_exception = e
                 if attempt < self._max_retries - 1:
@@ -82,50 +132,170 @@ class WordPressPosterTool(BaseTool):
 
     def _get_credentials(self) -> Tuple[str, str, str]:
         """Get and validate WordPress credentials"""
-        load_dotenv()
-        
+        config = self._get_config()
+        return config.posts_url, config.user, config.password
+
+    @staticmethod
+    def _dotenv_mtime(path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(path) if path else None
+        except OSError:
+            return None
+
+    def _get_config(self) -> WordPressConfig:
+        """Return the resolved config, reloading it only if the .env file changed"""
+        if self._config is None:
+            return self.reload_config()
+        path, mtime = self._dotenv_state
+        if path and self._dotenv_mtime(path) != mtime:
+            logger.info(f"{path} changed, reloading WordPress config")
+            return self.reload_config(override=True)
+        return self._config
+
+    def reload_config(self, override: bool = False) -> WordPressConfig:
+        """Read credentials from the environment and .env file and derive the REST endpoints
+
+        Variables already set in the environment win over the .env file
+        unless `override` is set.
+        """
+        path = find_dotenv()
+        if path:
+            load_dotenv(path, override=override)
+
         url = os.getenv("WORDPRESS_URL")
         user = os.getenv("WORDPRESS_USER")
         password = os.getenv("WORDPRESS_PASS")
-        
+
         logger.debug("Checking WordPress credentials...")
-        
+
         if not url:
             raise ValueError("WORDPRESS_URL not set in environment variables")
         if not user:
             raise ValueError("WORDPRESS_USER not set in environment variables")
         if not password:
             raise ValueError("WORDPRESS_PASS not set in environment variables")
-        
+
         logger.info("WordPress credentials validated successfully")
-        api_url = self._build_api_url(url)
-        return api_url, user, password
+        posts_url = self._build_api_url(url)
+        api_root = posts_url[:-len("/posts")]
+        self._config = WordPressConfig(
+            posts_url=posts_url,
+            tags_url=f"{api_root}/tags",
+            categories_url=f"{api_root}/categories",
+            media_url=f"{api_root}/media",
+            user=str(user),
+            password=str(password),
+        )
+        self._dotenv_state = (path, self._dotenv_mtime(path))
+        return self._config
 
     def _get_or_create_tag(self, tag_name: str, auth: HTTPBasicAuth) -> Optional[int]:
         """Get tag ID or create if it doesn't exist"""
-        url, _, _ = self._get_credentials()
-        base_url = url.split('/wp-json')[0]
-        tags_url = f"{base_url}/wp-json/wp/v2/tags"
-        
-        # First try to find existing tag
-        search_params = {'search': tag_name}
-        response = requests.get(tags_url, params=search_params, auth=auth)
-        
-        if response.ok:
-            existing_tags = response.json()
-            if existing_tags:
-                return existing_tags[0]['id']
-        
-        # Create new tag if not found
-        payload = {'name': tag_name}
-        response = requests.post(tags_url, json=payload, auth=auth)
-        
+        tag_ids, _ = self._resolve_tags([tag_name], auth)
+        return tag_ids[0] if tag_ids else None
+
+    def _lookup_tags(self, tags_url: str, slugs: List[str], auth: HTTPBasicAuth) -> Dict[str, int]:
+        """Return the IDs of existing tags with exactly the given slugs"""
+        found: Dict[str, int] = {}
+        for i in range(0, len(slugs), TAG_LOOKUP_BATCH):
+            batch = slugs[i:i + TAG_LOOKUP_BATCH]
+            params = {'slug': ','.join(batch), 'per_page': TAG_LOOKUP_BATCH, '_fields': 'id,slug'}
+            response = self._send("GET", tags_url, params=params, auth=auth)
+            if not response.ok:
+                logger.warning(f"Tag lookup failed: HTTP {response.status_code}")
+                continue
+            # Slugs of non-ASCII tags come back percent-encoded
+            found.update({unquote(tag['slug']): tag['id'] for tag in response.json() if unquote(tag['slug']) in batch})
+        return found
+
+    def _create_tag(self, tags_url: str, tag_name: str, slug: str, auth: HTTPBasicAuth) -> Optional[int]:
+        response = self._send("POST", tags_url, json={'name': tag_name, 'slug': slug}, auth=auth)
         if response.ok:
-            new_tag = response.json()
-            return new_tag['id']
-        else:
-            logger.warning(f"Failed to create tag '{tag_name}': {response.text}")
-            return None
+            return response.json()['id']
+        if response.status_code == 400:
+            # Created by someone else since the lookup; WordPress names the existing term
+            try:
+                error = response.json()
+            except ValueError:
+                error = {}
+            if error.get('code') == 'term_exists' and error.get('data', {}).get('term_id'):
+                return error['data']['term_id']
+        logger.warning(f"Failed to create tag '{tag_name}': {response.text}")
+        return None
+
+    def _resolve_tags(self, tag_names: List[str], auth: HTTPBasicAuth) -> Tuple[List[int], List[int]]:
+        """Return the IDs of the given tags, and which of them were served from the cache
+
+        Tags missing from the cache are looked up by exact slug in a single
+        request, and only those that don't exist yet are created, in parallel.
+        """
+        cache = self._get_tag_cache()
+        tags_url = self._get_config().tags_url
+        if cache is not None and self.tag_cache_warmup and tag_names and not cache.is_warm(tags_url):
+            self.warm_tag_cache(auth)
+
+        names_by_slug: Dict[str, str] = {}
+        for tag_name in tag_names:
+            slug = tag_slug(tag_name)
+            if not slug:
+                logger.warning(f"Skipping tag '{tag_name}' without letters or digits")
+                continue
+            names_by_slug.setdefault(slug, tag_name)
+
+        found: Dict[str, int] = {}
+        if cache is not None:
+            for slug in names_by_slug:
+                tag_id = cache.get(tags_url, slug)
+                if tag_id is not None:
+                    found[slug] = tag_id
+        cached_ids = list(found.values())
+
+        missing = [slug for slug in names_by_slug if slug not in found]
+        # A warm cache holds every tag of the site, so tags missing from it are new
+        if missing and (cache is None or not cache.is_warm(tags_url)):
+            found.update(self._lookup_tags(tags_url, missing, auth))
+        to_create = [slug for slug in names_by_slug if slug not in found]
+        if to_create:
+            with ThreadPoolExecutor(max_workers=min(len(to_create), self.pool_maxsize)) as executor:
+                created = executor.map(lambda slug: self._create_tag(tags_url, names_by_slug[slug], slug, auth), to_create)
+                found.update((slug, tag_id) for slug, tag_id in zip(to_create, created) if tag_id)
+
+        if cache is not None:
+            cache.set_many(tags_url, {slug: tag_id for slug, tag_id in found.items() if tag_id not in cached_ids})
+        tag_ids = []
+        for slug in names_by_slug:
+            if slug in found and found[slug] not in tag_ids:
+                tag_ids.append(found[slug])
+        return tag_ids, cached_ids
+
+    def warm_tag_cache(self, auth: HTTPBasicAuth) -> int:
+        """Page through all tags of the site into the cache and return how many were loaded"""
+        cache = self._get_tag_cache()
+        if cache is None:
+            raise ValueError("Tag cache is disabled (tag_cache_path is None)")
+        tags_url = self._get_config().tags_url
+
+        loaded: Dict[str, int] = {}
+        page = 1
+        while True:
+            params = {'per_page': 100, 'page': page, '_fields': 'id,slug'}
+            response = self._send("GET", tags_url, params=params, auth=auth)
+            if not response.ok:
+                logger.warning(f"Tag cache warm-up stopped at page {page}: HTTP {response.status_code}")
+                cache.set_many(tags_url, loaded)
+                return len(loaded)
+            tags = response.json()
+            # Slugs of non-ASCII tags come back percent-encoded
+            loaded.update({unquote(tag['slug']): tag['id'] for tag in tags})
+            total_pages = int(response.headers.get('X-WP-TotalPages') or page)
+            if not tags or page >= total_pages:
+                break
+            page += 1
+
+        cache.set_many(tags_url, loaded)
+        cache.mark_warm(tags_url)
+        logger.info(f"Loaded {len(loaded)} tags into the tag cache")
+        return len(loaded)
 
     def _validate_response(self, response: requests.Response) -> Dict[str, Any]:
         """Validate the WordPress API response"""
@@ -178,15 +348,11 @@ class WordPressPosterTool(BaseTool):
                 raise ValueError("Tags must be a list")
             
             # Get WordPress credentials
-            url, user, password = self._get_credentials()
-            auth = HTTPBasicAuth(str(user), str(password))
+            config = self._get_config()
+            url, auth = config.posts_url, config.auth
             
             # Process tags first to get their IDs
-            tag_ids = []
-            for tag_name in post_dict['tags']:
-                tag_id = self._get_or_create_tag(tag_name, auth)
-                if tag_id:
-                    tag_ids.append(tag_id)
+            tag_ids, cached_ids = self._resolve_tags(post_dict['tags'], auth)
             
             # Format payload according to WordPress REST API requirements
             payload = {
@@ -215,8 +381,24 @@ class WordPressPosterTool(BaseTool):
             except requests.RequestException as e:
                 raise RuntimeError(f"Failed to connect to WordPress: {str(e)}")
 
+            cache = self._get_tag_cache()
+            if response.status_code == 400 and cached_ids and cache is not None:
+                # A cached tag may have been deleted since; look the tags up again and retry once
+                cache.invalidate(config.tags_url, cached_ids)
+                logger.warning("WordPress rejected the post, retrying with freshly resolved tags")
+                payload["tags"], _ = self._resolve_tags(post_dict['tags'], auth)
+                try:
+                    response = self._make_request_with_retry(url=url, auth=auth, headers=headers, payload=payload)
+                except requests.RequestException as e:
+                    raise RuntimeError(f"Failed to connect to WordPress: {str(e)}")
+
             # Validate and return response
             result = self._validate_response(response)
+            dropped = set(payload["tags"]) - set(result.get("tags", payload["tags"]))
+            if dropped and cache is not None:
+                # WordPress silently ignores unknown tag IDs
+                cache.invalidate(config.tags_url, dropped)
+                logger.warning(f"WordPress ignored tag IDs {sorted(dropped)}, removed them from the tag cache")
             logger.info(f"Successfully created post {result.get('id')} at {result.get('link')}")
             return result
 